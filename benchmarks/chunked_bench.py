@@ -0,0 +1,77 @@
+"""Windowed scoring of a huge input against scanning it whole.
+
+Builds a multi-megabyte text from sample messages, scores it once with
+``CompiledRules.scan`` and once in windows, checks the two results are
+identical, and reports time and peak traced memory for each.
+
+Usage:
+    python benchmarks/chunked_bench.py [--megabytes 20] [--window 65536]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scam_core import get_compiled_rules  # noqa: E402
+from scam_core.chunked import DEFAULT_MAX_SPAN, scan_chunks  # noqa: E402
+
+MESSAGES = [
+    "URGENT!!! You are a WINNER. Click link http://example.com to claim $1,000,000 now\n",
+    "Your account is suspended. Verify account and confirm identity immediately\n",
+    "Hi, thank you for the notes. Best regards\n",
+    "Send funds via western union, do not tell anyone. This is confidential\n",
+    "Good morning, how are you? Lunch at 1pm works for me.\n",
+    "aap ka account band ho jayega, turant KYC update karo\n",
+]
+
+
+def chunks_of(message_count: int, chunk_size: int):
+    """Yield the benchmark text in chunks without building it whole"""
+    buffer = []
+    size = 0
+    for i in range(message_count):
+        message = MESSAGES[i % len(MESSAGES)]
+        buffer.append(message)
+        size += len(message)
+        if size >= chunk_size:
+            yield ''.join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+def measure(label: str, fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<10} {elapsed:8.2f} s   peak {peak / 2**20:8.1f} MiB   score {result.score:.1f}")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--megabytes', type=float, default=20)
+    parser.add_argument('--window', type=int, default=65536)
+    parser.add_argument('--max-span', type=int, default=DEFAULT_MAX_SPAN)
+    args = parser.parse_args()
+
+    rules = get_compiled_rules()
+    average = sum(map(len, MESSAGES)) / len(MESSAGES)
+    count = int(args.megabytes * 2**20 / average)
+    chunked = measure('windowed', lambda: scan_chunks(
+        chunks_of(count, 8192), rules, window=args.window, max_span=args.max_span
+    ))
+    whole = measure('whole', lambda: rules.scan(''.join(chunks_of(count, 8192))))
+    same = (whole.rule_ids, whole.values, whole.score) == (chunked.rule_ids, chunked.values, chunked.score)
+    print("results identical" if same else "RESULTS DIFFER")
+
+
+if __name__ == '__main__':
+    main()
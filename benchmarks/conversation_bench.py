@@ -0,0 +1,70 @@
+"""Conversation store memory and update cost at hundreds of thousands of threads.
+
+Messages are scanned once up front and their results replayed, so the
+numbers show the store itself rather than rule evaluation.
+
+Usage:
+    python benchmarks/conversation_bench.py [--conversations 300000] [--messages 3]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scam_core import ScamDetector  # noqa: E402
+from scam_core.conversation import ConversationStore  # noqa: E402
+
+MESSAGES = [
+    "Hi dear, how are you? I loved our chat yesterday",
+    "I need your help urgently, it's an emergency, please respond asap",
+    "Please send money via western union or a gift card today",
+    "Good morning! Thank you for the photos",
+    "Your account is suspended, verify account at http://example.com",
+    "Aapka khata band ho jayega, turant KYC update karo",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--conversations', type=int, default=300000)
+    parser.add_argument('--messages', type=int, default=3)
+    parser.add_argument('--max-mib', type=int, default=512)
+    args = parser.parse_args()
+
+    detector = ScamDetector()
+    scans = [detector.scan(text) for text in MESSAGES]
+    rng = random.Random(0)
+    ids = [f"conv-{i:08d}" for i in range(args.conversations)]
+    schedule = [(cid, rng.choice(scans)) for _ in range(args.messages) for cid in ids]
+    rng.shuffle(schedule)
+
+    def fill():
+        store = ConversationStore(detector, max_conversations=args.conversations,
+                                  max_bytes=args.max_mib * 2**20)
+        for cid, scan in schedule:
+            store.add_scan(cid, scan)
+        return store
+
+    start = time.perf_counter()
+    fill()
+    elapsed = time.perf_counter() - start
+
+    # Separate pass: tracemalloc slows allocation-heavy code several times over
+    tracemalloc.start()
+    store = fill()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    stats = store.stats()
+    print(f"conversations   {stats['conversations']}")
+    print(f"updates         {len(schedule)} in {elapsed:.2f}s ({elapsed / len(schedule) * 1e6:.1f} us/update)")
+    print(f"traced memory   {current / 2**20:.1f} MiB ({current / max(stats['conversations'], 1):.0f} B/conversation)")
+    print(f"store estimate  {stats['bytes_used'] / 2**20:.1f} MiB   evicted {stats['evicted']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+"""Email ingest throughput: MIME parsing, HTML-to-text and end-to-end scoring.
+
+Runs on a directory of ``.eml`` files (for example the SpamAssassin public
+corpus) or, by default, on a generated corpus mixing table-heavy HTML
+newsletters, phishing mail with mismatched links, plain personal mail and
+base64-encoded HTML with attachments. The regex tokenizer is compared with
+the standard library's ``html.parser``, and end-to-end ingest with scoring
+the raw message source as text. Adversarial markup of unclosed tags checks
+that the tokenizer stays linear in the input size.
+
+Usage:
+    python benchmarks/email_bench.py [--corpus DIR] [--messages 2000] [--repeat 3]
+"""
+import argparse
+import glob
+import os
+import random
+import sys
+import time
+from email import message_from_bytes, policy
+from email.message import EmailMessage
+from html.parser import HTMLParser
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scam_core import ScamDetector  # noqa: E402
+from scam_core.mail import analyze_email, html_to_text, parse_email  # noqa: E402
+
+NEWSLETTER_ROW = (
+    '<tr><td class="item" style="padding:12px;font-family:Arial,Helvetica"><table width="100%"><tr>'
+    '<td><img src="https://cdn.example.com/img/{i}.png" width="120" alt="Product {i}"></td>'
+    '<td><h3 style="margin:0">New arrivals &ndash; week {i}</h3><p>Fresh picks for the season, '
+    'now with free shipping on orders over $50.</p><a href="https://shop.example.com/p/{i}?utm_source=nl">'
+    'Shop now</a></td></tr></table></td></tr>\n'
+)
+PHISH_HTML = (
+    '<html><head><style>p {{font-size:14px}} .btn {{background:#0070BA}}</style></head><body>'
+    '<p>Dear {name},</p><p>We noticed UNUSUAL sign-in activity. Your account has been limited. '
+    'Verify account within 24 hours to avoid permanent suspension.</p>'
+    '<p><a class="btn" href="http://{host}/secure/login?session={i}">https://www.{brand}.com/signin</a></p>'
+    '<p>Thank you,<br>The {brand} Team</p><!-- tracking {i} --></body></html>'
+)
+PLAIN = (
+    "Hi {name},\n\nThanks for the notes from this morning's meeting. I've attached the "
+    "slides; let me know if lunch on Thursday still works.\n\nBest regards,\nPriya\n"
+)
+# Tags that never close; each '<' must fail at the next one, not at the end
+UNCLOSED = ('<a x', '<b x', '<!x', '<script x')
+NAMES = ['Alex', 'Sam', 'Jordan', 'Priya', 'Wei', 'Fatima']
+BRANDS = ['paypal', 'amazon', 'netflix', 'chase']
+
+
+def generate(count: int, seed: int = 1) -> list:
+    rng = random.Random(seed)
+    messages = []
+    for i in range(count):
+        message = EmailMessage()
+        message['From'] = 'sender@example.com'
+        message['To'] = 'you@example.com'
+        kind = i % 4
+        name = rng.choice(NAMES)
+        if kind == 0:
+            message['Subject'] = f'Weekly picks #{i}'
+            message.set_content('View this email in your browser: https://shop.example.com/nl')
+            rows = ''.join(NEWSLETTER_ROW.format(i=j) for j in range(rng.randint(10, 40)))
+            message.add_alternative(f'<html><body><table width="600">{rows}</table></body></html>', subtype='html')
+        elif kind == 1:
+            brand = rng.choice(BRANDS)
+            message['Subject'] = 'Action required: account limited'
+            message.set_content(PHISH_HTML.format(
+                name=name, brand=brand, host=f'{brand}.com.account-verify{i}.io', i=i
+            ), subtype='html')
+        elif kind == 2:
+            message['Subject'] = 'Notes from today'
+            message.set_content(PLAIN.format(name=name))
+            message.add_attachment(os.urandom(rng.randint(20_000, 200_000)), maintype='application',
+                                   subtype='pdf', filename='slides.pdf')
+        else:
+            message['Subject'] = 'Your receipt'
+            body = ''.join(NEWSLETTER_ROW.format(i=j) for j in range(5))
+            message.set_content(f'<html><body><table>{body}</table></body></html>', subtype='html', cte='base64')
+        messages.append(message.as_bytes())
+    return messages
+
+
+class _StdlibText(HTMLParser):
+    """Baseline: text extraction with the standard library's HTMLParser"""
+
+    def __init__(self):
+        super().__init__()
+        self.parts = []
+        self.skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ('script', 'style', 'head'):
+            self.skip += 1
+
+    def handle_endtag(self, tag):
+        if tag in ('script', 'style', 'head'):
+            self.skip -= 1
+
+    def handle_data(self, data):
+        if not self.skip:
+            self.parts.append(data)
+
+
+def stdlib_text(markup: str) -> str:
+    parser = _StdlibText()
+    parser.feed(markup)
+    parser.close()
+    return ' '.join(parser.parts)
+
+
+def timed(label: str, fn, items, repeat: int, total_bytes: int):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            fn(item)
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<28} {len(items) / best:10.0f} msg/s {total_bytes / best / 2**20:8.1f} MiB/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--corpus', help="directory of .eml files (default: generated)")
+    parser.add_argument('--messages', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    if args.corpus:
+        messages = []
+        for path in sorted(glob.glob(os.path.join(args.corpus, '**', '*.eml'), recursive=True)):
+            with open(path, 'rb') as f:
+                messages.append(f.read())
+        messages = messages[:args.messages]
+    else:
+        messages = generate(args.messages)
+    total = sum(map(len, messages))
+    print(f"{len(messages)} messages, {total / 2**20:.1f} MiB")
+
+    detector = ScamDetector()
+    parsed = [parse_email(message) for message in messages]
+    markups = []
+    for message in messages:
+        for part in message_from_bytes(message, policy=policy.default).walk():
+            if part.get_content_type() == 'text/html':
+                markups.append(part.get_content())
+    html_bytes = sum(len(markup.encode('utf-8')) for markup in markups)
+
+    timed("parse_email", parse_email, messages, args.repeat, total)
+    timed("html_to_text (regex)", html_to_text, markups, args.repeat, html_bytes)
+    timed("html.parser baseline", stdlib_text, markups, args.repeat, html_bytes)
+    timed("score parsed email", lambda email: analyze_email(detector, email), parsed, args.repeat, total)
+    timed("ingest + score", lambda message: analyze_email(detector, parse_email(message)),
+          messages, args.repeat, total)
+    timed("score raw source as text",
+          lambda message: detector.analyze_text(message.decode('utf-8', 'replace')),
+          messages, args.repeat, total)
+    for size in (80_000, 160_000, 1_000_000):
+        adversarial = [(pattern * (size // len(pattern) + 1))[:size] for pattern in UNCLOSED]
+        timed(f"html_to_text unclosed {size // 1000}K", html_to_text, adversarial, 1,
+              size * len(adversarial))
+    mismatched = sum(1 for email in parsed for link in email.links if link.mismatched)
+    print(f"{mismatched} mismatched links found")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""Hashed n-gram model inference cost next to the rule scan.
+
+Times single-message inference (the pure-Python sparse dot product), the
+vectorized NumPy batch path, and the rules alone and blended, per message.
+Uses a saved model, or random weights of the given size, since inference
+cost does not depend on the weight values.
+
+Usage:
+    python benchmarks/hashed_model_bench.py [--model hashed_model.bin] [--bits 18] [--repeat 500]
+"""
+import argparse
+import os
+import sys
+import time
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scam_core import ScamDetector  # noqa: E402
+from scam_core.hashed import DEFAULT_BITS, HashedModel  # noqa: E402
+
+MESSAGES = [
+    "URGENT!!! You are a WINNER. Click link http://example.com to claim $1,000,000 now",
+    "Your account is suspended. Verify account and confirm identity immediately",
+    "Hi, thank you for the notes. Best regards",
+    "Send funds via western union, do not tell anyone. This is confidential",
+    "Good morning, how are you? Lunch at 1pm works for me.",
+    "aap ka account band ho jayega, turant KYC update karo",
+]
+
+
+def per_message(fn, repeat: int) -> float:
+    fn(MESSAGES[0])
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in MESSAGES:
+            fn(text)
+    return (time.perf_counter() - start) / (repeat * len(MESSAGES))
+
+
+def per_message_batch(fn, repeat: int, batch: int) -> float:
+    texts = (MESSAGES * (batch // len(MESSAGES) + 1))[:batch]
+    rounds = max(repeat * len(MESSAGES) // batch, 1)
+    fn(texts)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn(texts)
+    return (time.perf_counter() - start) / (rounds * batch)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--model', help="saved model (default: random weights)")
+    parser.add_argument('--bits', type=int, default=DEFAULT_BITS)
+    parser.add_argument('--repeat', type=int, default=500)
+    parser.add_argument('--batch', type=int, default=1024)
+    args = parser.parse_args()
+
+    if args.model:
+        model = HashedModel.load(args.model)
+    else:
+        import random
+        rng = random.Random(0)
+        model = HashedModel(array('f', (rng.gauss(0, 1) for _ in range(1 << args.bits))), bits=args.bits)
+    print(f"model: 2^{model.bits} buckets, {len(model.weights) * 4 / 2**20:.1f} MiB of weights")
+
+    rules = ScamDetector()
+    blended = ScamDetector(model=model)
+    rows = [
+        ("model, one message", per_message(model.probability, args.repeat)),
+        (f"model, batch of {args.batch}", per_message_batch(model.probability_batch, args.repeat, args.batch)),
+        ("rules only", per_message(rules.scan, args.repeat)),
+        ("rules + model", per_message(blended.scan, args.repeat)),
+        (f"rules + model, batch of {args.batch}", per_message_batch(blended.scan_batch, args.repeat, args.batch)),
+    ]
+    for label, seconds in rows:
+        print(f"{label:<32} {seconds * 1e6:8.1f} us/msg")
+
+
+if __name__ == '__main__':
+    main()
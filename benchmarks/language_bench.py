@@ -0,0 +1,88 @@
+"""Scoring cost on mixed-script input, with and without the language packs.
+
+English-only traffic pays only for script detection (the norm+detect
+column includes normalization); Devanagari and Hinglish messages also pay
+for their own pack. A second table grows the romanized Hindi pack with
+synthetic keywords to show that its indexed matching stays flat in the pack
+size, next to one substring search per keyword.
+
+Usage:
+    python benchmarks/language_bench.py [--repeat 1000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scam_core.detector import CompiledRules, KeywordTable  # noqa: E402
+from scam_core.language import FOLDS, detect_scripts  # noqa: E402
+from scam_core.normalize import normalize  # noqa: E402
+from scam_core.rules import default_rule_pack  # noqa: E402
+
+CORPORA = {
+    'english': [
+        "URGENT! Your account is suspended. Verify account at http://example.com",
+        "Hi, thank you for the notes. Best regards",
+    ],
+    'devanagari': [
+        "बधाई हो! आप लॉटरी के विजेता हैं। तुरंत इनाम के लिए लिंक पर क्लिक करें",
+        "आपका खाता बंद हो जाएगा, केवाईसी अपडेट करें और ओटीपी भेजें",
+    ],
+    'hinglish': [
+        "Aapka khaata band ho jayega, turant KYC update karo aur OTP share karo",
+        "Bhai kal milte hai, paise ka hisaab kar lena",
+    ],
+    'code-mixed': [
+        "Congratulations! आप winner हैं, turant link pe click karo and claim your prize",
+        "Dear customer, आपका account suspended hai, verify karein: http://example.in",
+    ],
+}
+
+
+def per_message(fn, texts, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            fn(text)
+    return (time.perf_counter() - start) / (repeat * len(texts)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=1000)
+    args = parser.parse_args()
+
+    english_only = default_rule_pack()
+    english_only['language_packs'] = {}
+    without = CompiledRules(english_only)
+    with_packs = CompiledRules()
+
+    print(f"{'corpus':<12} {'detected':<22} {'no packs':>10} {'with packs':>12} {'norm+detect':>12}  (us/msg)")
+    for name, texts in CORPORA.items():
+        detected = sorted({script for text in texts for script in detect_scripts(normalize(text))})
+        base = per_message(without.scan, texts, args.repeat)
+        packs = per_message(with_packs.scan, texts, args.repeat)
+        detect = per_message(lambda t: detect_scripts(normalize(t)), texts, args.repeat)
+        print(f"{name:<12} {','.join(detected) or '-':<22} {base:10.1f} {packs:12.1f} {detect:12.1f}")
+
+    pack = default_rule_pack()['language_packs']['hi-Latn']
+    fold = FOLDS[pack['script']]
+    texts = [fold(normalize(text)) for text in CORPORA['hinglish'] + CORPORA['code-mixed']]
+    rng = random.Random(0)
+    print(f"\n{'hi-Latn keywords':<18} {'indexed':>10} {'per keyword':>12}  (us/msg)")
+    for extra in (0, 500, 5000):
+        keywords = dict(pack['scam_keywords'])
+        while len(keywords) < len(pack['scam_keywords']) + extra:
+            word = ''.join(rng.choice('abcdeghijklmnoprstuvy') for _ in range(rng.randint(4, 10)))
+            keywords[word] = 1.0
+        indexed = KeywordTable(keywords.items(), fold=fold, indexed=True)
+        plain = KeywordTable(keywords.items(), fold=fold)
+        print(f"{len(keywords):<18} {per_message(indexed.match, texts, args.repeat):10.1f} "
+              f"{per_message(plain.match, texts, args.repeat):12.1f}")
+
+
+if __name__ == '__main__':
+    main()
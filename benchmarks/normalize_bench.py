@@ -0,0 +1,49 @@
+"""Normalization overhead relative to a full scoring pass.
+
+Usage:
+    python benchmarks/normalize_bench.py [--repeat 2000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scam_core import get_compiled_rules  # noqa: E402
+from scam_core.normalize import normalize  # noqa: E402
+
+MESSAGES = [
+    "U R G E N T: you are the w1nner of our l0ttery, cl1ck l1nk http://example.com",
+    "Ur​gent аccount verificаtion needed. Act   now!!!",
+    "Ｗｉｎｎｅｒ! Send a gift card to claim $5,000",
+    "Hi, thank you for the notes from this morning's meeting. Best regards, Priya",
+    "Your parcel is held at customs. Pay the fee within 24 hours: https://track.example",
+    "Good morning! How are you? " * 20,
+]
+
+
+def per_call(fn, texts, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            fn(text)
+    return (time.perf_counter() - start) / (repeat * len(texts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    rules = get_compiled_rules()
+    scan_time = per_call(rules.scan, MESSAGES, args.repeat)
+    normalize_time = per_call(normalize, MESSAGES, args.repeat)
+    share = normalize_time / scan_time
+    print(f"scan (includes normalize) {scan_time * 1e6:8.2f} us/msg")
+    print(f"normalize                 {normalize_time * 1e6:8.2f} us/msg   {share:.1%} of scoring")
+    print("within 10% budget" if share < 0.10 else "OVER 10% budget")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""Compare dict results with compact ScanResult objects for bulk scoring.
+
+Usage:
+    python benchmarks/result_memory_bench.py [--messages 20000]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scam_core import ScamDetector  # noqa: E402
+
+MESSAGES = [
+    "URGENT!!! You are a WINNER. Click link http://example.com to claim $1,000,000 now",
+    "Your account is suspended. Verify account and confirm identity immediately",
+    "Hi, thank you for the notes. Best regards",
+    "Send funds via western union, do not tell anyone. This is confidential",
+    "Good morning, how are you? Lunch at 1pm works for me.",
+]
+
+
+def measure(label: str, score_all, texts):
+    tracemalloc.start()
+    start = time.perf_counter()
+    results = score_all(texts)
+    elapsed = time.perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<28} {elapsed * 1e6 / len(texts):8.1f} us/msg   "
+          f"retained {retained / len(texts):7.1f} B/msg   peak {peak / 2**20:7.2f} MiB")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--messages', type=int, default=20000)
+    args = parser.parse_args()
+
+    texts = [MESSAGES[i % len(MESSAGES)] + f" #{i}" for i in range(args.messages)]
+    detector = ScamDetector()
+    detector.analyze_text(texts[0])  # compile outside the measurement
+
+    measure('dict (calculate_scam_score)', lambda ts: [detector.calculate_scam_score(t) for t in ts], texts)
+    measure('ScanResult (scan_batch)', detector.scan_batch, texts)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""Per-worker memory with private vs shared (memory-mapped) rule tables.
+
+Builds a synthetic rule pack with a large keyword table, then starts groups
+of fresh worker processes that each score a few messages and report their
+private (anonymous) resident memory. Linux only (reads /proc/self/status).
+
+Usage:
+    python benchmarks/shared_rules_bench.py [--keywords 200000] [--workers 1 2 4 8]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scam_core import ScamDetector  # noqa: E402
+from scam_core.rules import default_rule_pack, load_rule_pack  # noqa: E402
+from scam_core.shared import publish_rule_pack  # noqa: E402
+
+MESSAGES = [
+    "URGENT!!! You are a WINNER. Click link http://example.com to claim $1,000,000 now",
+    "Your account is suspended. Verify account and confirm identity immediately",
+    "Hi, thank you for the notes. Best regards",
+]
+
+
+def rss_anon_kib() -> int:
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('RssAnon:'):
+                return int(line.split()[1])
+    return 0
+
+
+def worker(mode: str, path: str, queue):
+    baseline = rss_anon_kib()
+    if mode == 'shared':
+        detector = ScamDetector(shared_rules=path)
+    else:
+        detector = ScamDetector(rule_pack=load_rule_pack(path))
+    start = time.perf_counter()
+    for message in MESSAGES * 20:
+        detector.analyze_text(message)
+    elapsed = time.perf_counter() - start
+    queue.put((rss_anon_kib() - baseline, elapsed / (len(MESSAGES) * 20)))
+
+
+def synthetic_pack(n_keywords: int) -> dict:
+    rng = random.Random(0)
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    pack = default_rule_pack()
+    while len(pack['scam_keywords']) < n_keywords:
+        words = [''.join(rng.choice(letters) for _ in range(rng.randint(4, 9)))
+                 for _ in range(rng.randint(1, 3))]
+        pack['scam_keywords'][' '.join(words)] = round(rng.uniform(1.0, 4.0), 1)
+    return pack
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--keywords', type=int, default=200000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    pack = synthetic_pack(args.keywords)
+    tmp = tempfile.mkdtemp()
+    json_path = os.path.join(tmp, 'pack.json')
+    segment_path = os.path.join(tmp, 'pack.seg')
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(pack, f)
+    publish_rule_pack(pack, segment_path)
+    print(f"{len(pack['scam_keywords'])} keywords; segment {os.path.getsize(segment_path) / 2**20:.1f} MiB")
+
+    ctx = multiprocessing.get_context('spawn')
+    for mode, path in (('private', json_path), ('shared', segment_path)):
+        for count in args.workers:
+            queue = ctx.Queue()
+            procs = [ctx.Process(target=worker, args=(mode, path, queue)) for _ in range(count)]
+            for proc in procs:
+                proc.start()
+            results = [queue.get() for _ in procs]
+            for proc in procs:
+                proc.join()
+            private_kib = [r[0] for r in results]
+            latency = statistics.median(r[1] for r in results)
+            print(f"{mode:<8} workers {count:>2}   private RSS/worker {statistics.mean(private_kib) / 1024:7.1f} MiB   "
+                  f"total {sum(private_kib) / 1024:8.1f} MiB   {latency * 1e3:7.2f} ms/msg")
+
+
+if __name__ == '__main__':
+    main()
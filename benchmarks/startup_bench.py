@@ -0,0 +1,82 @@
+"""Measure import-to-first-verdict time for library and server use.
+
+Each sample runs in a fresh interpreter so module caches and compiled rule
+state start cold, the way they do on a CLI invocation or a serverless cold
+start. Timings are printed to stderr, on a line marked with
+``TIMINGS_PREFIX``, so whatever the app writes to stdout (its event log,
+banners) does not get in the way.
+
+Usage:
+    python benchmarks/startup_bench.py [--runs 20] [--app unified_app]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TIMINGS_PREFIX = 'startup-bench-timings'
+SAMPLE = "URGENT! You are a winner. Click link http://example.com to claim $1,000 now!!"
+
+LIBRARY_SNIPPET = """
+import sys, time
+t0 = time.perf_counter()
+from scam_core import ScamDetector
+t1 = time.perf_counter()
+ScamDetector().analyze_text({sample!r})
+t2 = time.perf_counter()
+print({prefix!r}, t1 - t0, t2 - t0, file=sys.stderr)
+"""
+
+SERVER_SNIPPET = """
+import sys, time
+t0 = time.perf_counter()
+import {app}
+t1 = time.perf_counter()
+client = {app}.app.test_client()
+client.post('/analyze', json={{'text': {sample!r}, 'message': {sample!r}}})
+t2 = time.perf_counter()
+print({prefix!r}, t1 - t0, t2 - t0, file=sys.stderr)
+"""
+
+
+def run_sample(snippet: str):
+    """Run one cold-start sample, returning (import_seconds, first_verdict_seconds)"""
+    output = subprocess.run(
+        [sys.executable, '-c', snippet],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    ).stderr
+    for line in output.splitlines():
+        fields = line.split()
+        if fields[:1] == [TIMINGS_PREFIX]:
+            return float(fields[1]), float(fields[2])
+    raise ValueError(f"no timings line in output: {output[-200:]!r}")
+
+
+def report(label: str, snippet: str, runs: int):
+    samples = [run_sample(snippet) for _ in range(runs)]
+    imports = [s[0] * 1000 for s in samples]
+    verdicts = [s[1] * 1000 for s in samples]
+    print(f"{label:<24} import p50 {statistics.median(imports):7.2f} ms   "
+          f"first verdict p50 {statistics.median(verdicts):7.2f} ms   "
+          f"max {max(verdicts):7.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--app', default='unified_app',
+                        help="Flask module to time for server use")
+    args = parser.parse_args()
+
+    report('library (scam_core)', LIBRARY_SNIPPET.format(sample=SAMPLE, prefix=TIMINGS_PREFIX), args.runs)
+    try:
+        report(f'server ({args.app})',
+               SERVER_SNIPPET.format(app=args.app, sample=SAMPLE, prefix=TIMINGS_PREFIX), args.runs)
+    except subprocess.CalledProcessError as e:
+        print(f"server ({args.app}) skipped: {e.stderr.strip().splitlines()[-1]}")
+
+
+if __name__ == '__main__':
+    main()
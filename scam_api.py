@@ -0,0 +1,267 @@
+"""Scoring API shared by unified_app.py and backend_only.py.
+
+``ScamService`` holds the per-process state behind the routes (detector,
+conversation store, optional shadow evaluator and event log, readiness), and
+``create_blueprint`` returns the routes as a Flask blueprint the apps
+register. Each app only adds its own ``/health`` payload.
+"""
+import os
+
+from flask import Blueprint, jsonify, request, send_from_directory
+
+from scam_core import ScamDetector, budget_stats, client_bundle
+from scam_core.conversation import ConversationStore
+from scam_core.events import EventLog, event_stream, parse_sample_rates
+from scam_core.mail import MAX_BYTES as MAX_EMAIL_BYTES, analyze_email, parse_email
+from scam_core.readiness import Readiness, scoring_paths
+from scam_core.rules import load_rule_pack
+from scam_core.shadow import ShadowEvaluator
+
+SUMMARIES = {
+    "HIGH RISK": "Multiple red flags detected - likely a scam",
+    "MEDIUM RISK": "Suspicious elements present - proceed with caution",
+    "LOW RISK": "Some concerns but appears mostly legitimate",
+    "SAFE": "No obvious scam indicators detected",
+    "NO TEXT": "Please provide a message to analyze.",
+}
+
+
+class UnifiedScamDetector(ScamDetector):
+    """scam_core detector plus the summary line shown by the frontend"""
+
+    SUMMARIES = SUMMARIES
+
+    def analyze_text(self, text: str, budget_ms: float = None) -> dict:
+        result = super().analyze_text(text or '', budget_ms)
+        result["summary"] = self.SUMMARIES.get(result["risk_level"], "")
+        return result
+
+
+def parse_budget(data: dict):
+    """Return the optional ``budget_ms`` field as a positive float"""
+    budget_ms = data.get('budget_ms')
+    if budget_ms is None:
+        return None
+    budget_ms = float(budget_ms)
+    if not budget_ms > 0:
+        raise ValueError("budget_ms must be positive")
+    return budget_ms
+
+
+def request_text(data: dict, field: str = 'text') -> str:
+    """Return ``data[field]`` as a string; missing or null reads as ''"""
+    text = data.get(field)
+    if text is None:
+        return ''
+    if not isinstance(text, str):
+        raise ValueError(f"{field} must be a string")
+    return text
+
+
+def _json_body() -> dict:
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        raise ValueError("request body must be a JSON object")
+    return data
+
+
+class ScamService:
+    """Detector and the per-process state the API routes share"""
+
+    def __init__(self, detector: ScamDetector, shadow: ShadowEvaluator = None,
+                 event_log: EventLog = None, max_p99_ms: float = None,
+                 max_email_bytes: int = MAX_EMAIL_BYTES):
+        self.detector = detector
+        self.max_email_bytes = max_email_bytes
+        self.conversations = ConversationStore(detector)
+        self.shadow = shadow
+        self.event_log = event_log
+        self.readiness = Readiness(version=lambda: detector.rules.version, max_p99_ms=max_p99_ms)
+
+    @classmethod
+    def from_env(cls) -> 'ScamService':
+        """Build the service from the SCAM_* environment variables"""
+        # Optional hashed n-gram model blended into the rule score
+        detector = UnifiedScamDetector(
+            model=os.environ.get('SCAM_MODEL_PATH'),
+            model_blend=float(os.environ.get('SCAM_MODEL_BLEND', '0.5'))
+        )
+        # Optional candidate rule pack scored off the request path for comparison
+        shadow = None
+        if os.environ.get('SCAM_SHADOW_RULE_PACK'):
+            # The candidate keeps the live model so only the rules differ
+            candidate = {
+                'rule_pack': load_rule_pack(os.environ['SCAM_SHADOW_RULE_PACK']),
+                'model': os.environ.get('SCAM_MODEL_PATH'),
+                'model_blend': detector.model_blend,
+            }
+            shadow = ShadowEvaluator(
+                detector, candidate,
+                sample_rate=float(os.environ.get('SCAM_SHADOW_SAMPLE_RATE', '0.05')),
+                max_length=int(os.environ.get('SCAM_SHADOW_MAX_LENGTH', '20000'))
+            )
+        # Per risk level, e.g. SCAM_EVENT_SAMPLE_RATES="LOW RISK=0.5,SAFE=0.05,*=1"
+        sample_rates, default_rate = parse_sample_rates(os.environ.get('SCAM_EVENT_SAMPLE_RATES', ''))
+        # SCAM_EVENT_LOG: stdout (default), stderr, a file path, or off
+        stream = event_stream(os.environ.get('SCAM_EVENT_LOG', 'stdout'))
+        event_log = None
+        if stream is not None:
+            event_log = EventLog(stream, sample_rates=sample_rates, default_rate=default_rate)
+        # SCAM_READY_MAX_P99_MS takes a slow instance out of rotation
+        max_p99_ms = os.environ.get('SCAM_READY_MAX_P99_MS')
+        return cls(detector, shadow, event_log, float(max_p99_ms) if max_p99_ms else None,
+                   int(os.environ.get('SCAM_MAX_EMAIL_BYTES', MAX_EMAIL_BYTES)))
+
+    def analyze(self, text: str, budget_ms: float = None) -> dict:
+        """``detector.analyze_text``, handing sampled verdicts to the shadow evaluator"""
+        shadow = self.shadow
+        if shadow is None or not shadow.sample(text):
+            return self.detector.analyze_text(text, budget_ms)
+        timings = {}
+        result = self.detector.scan(text, budget_ms, timings)
+        shadow.submit(text, result, timings)
+        response = self.detector.response(result, budgeted=budget_ms is not None)
+        response['summary'] = SUMMARIES.get(response['risk_level'], '')
+        return response
+
+    def start(self):
+        """Warm up every scoring path on a background thread"""
+        return self.readiness.start(scoring_paths(self.detector))
+
+    def health(self) -> dict:
+        """Fields every app's /health reports"""
+        health = {
+            'warmed_up': self.readiness.warmed_up,
+            'latency': self.readiness.latency(),
+            'latency_budget': budget_stats.snapshot(),
+        }
+        if self.event_log is not None:
+            health['event_log'] = self.event_log.stats()
+        return health
+
+
+def create_blueprint(service: ScamService) -> Blueprint:
+    """Frontend files and scoring routes backed by ``service``"""
+    api = Blueprint('scam_api', __name__)
+    detector = service.detector
+    readiness = service.readiness
+
+    def log_verdict(result: dict, route: str, **fields):
+        if service.event_log is not None:
+            service.event_log.log_verdict(result, route=route, **fields)
+
+    def log_error(route: str, error: Exception):
+        if service.event_log is not None:
+            service.event_log.log('analysis_error', route=route, error=repr(error))
+
+    @api.route('/')
+    def index():
+        try:
+            with open('index.html', 'r', encoding='utf-8') as f:
+                return f.read()
+        except FileNotFoundError:
+            return "index.html file not found", 404
+
+    @api.route('/styles.css')
+    def styles():
+        return send_from_directory('.', 'styles.css')
+
+    @api.route('/voice.js')
+    def voice_js():
+        return send_from_directory('.', 'voice.js')
+
+    @api.route('/scorer.js')
+    def scorer_js():
+        return send_from_directory('.', 'scorer.js')
+
+    @api.route('/rules')
+    def rules_bundle():
+        """Exportable rule pack for in-browser pre-scoring, revalidated by ETag"""
+        body, etag = client_bundle(detector.rules, server_model=detector.model is not None)
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+        if request.if_none_match.contains(etag.strip('"')):
+            return '', 304, headers
+        return body, 200, dict(headers, **{'Content-Type': 'application/json'})
+
+    @api.route('/analyze', methods=['POST'])
+    def analyze():
+        try:
+            try:
+                data = _json_body()
+                text = request_text(data)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            try:
+                budget_ms = parse_budget(data)
+            except (TypeError, ValueError) as e:
+                return jsonify({'error': f'Invalid budget_ms: {e}'}), 400
+            with readiness.track():
+                result = service.analyze(text, budget_ms)
+            log_verdict(result, '/analyze', length=len(text))
+            return jsonify(result)
+        except Exception as e:
+            log_error('/analyze', e)
+            return jsonify({'error': str(e)}), 500
+
+    @api.route('/analyze/email', methods=['POST'])
+    def analyze_email_route():
+        """Score a raw RFC 822 message, sent as the request body or an 'email' file upload"""
+        try:
+            max_bytes = service.max_email_bytes
+            if request.content_length is not None and request.content_length > max_bytes:
+                return jsonify({'error': f'message is larger than {max_bytes} bytes'}), 413
+            upload = request.files.get('email')
+            try:
+                email = parse_email(upload.stream if upload is not None else request.stream,
+                                    max_bytes=max_bytes)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 413
+            with readiness.track():
+                result = analyze_email(detector, email)
+            result['summary'] = SUMMARIES.get(result['risk_level'], '')
+            log_verdict(result, '/analyze/email', length=len(email.scored_text))
+            return jsonify(result)
+        except Exception as e:
+            log_error('/analyze/email', e)
+            return jsonify({'error': str(e)}), 500
+
+    @api.route('/conversation', methods=['POST'])
+    def conversation():
+        """Score a message in the context of its conversation so far"""
+        try:
+            try:
+                data = _json_body()
+                text = request_text(data)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            conversation_id = data.get('conversation_id')
+            if not conversation_id or not text.strip():
+                return jsonify({'error': 'conversation_id and text are required'}), 400
+            with readiness.track():
+                result = service.conversations.add_message(str(conversation_id), text)
+            result['summary'] = SUMMARIES.get(result['risk_level'], '')
+            log_verdict(result, '/conversation', length=len(text))
+            return jsonify(result)
+        except Exception as e:
+            log_error('/conversation', e)
+            return jsonify({'error': str(e)}), 500
+
+    @api.route('/shadow')
+    def shadow_summary():
+        """Verdict and stage timing differences between the live and candidate rule packs"""
+        if service.shadow is None:
+            return jsonify({'enabled': False})
+        return jsonify(dict(service.shadow.summary(), enabled=True))
+
+    @api.route('/ready')
+    def ready():
+        """Readiness probe: 503 while warming up or while p99 latency is over the limit"""
+        queues = {}
+        if service.shadow is not None:
+            queues['shadow'] = service.shadow.queued
+        if service.event_log is not None:
+            queues['event_log'] = service.event_log.queued
+        body, is_ready = readiness.report(**queues)
+        return jsonify(body), 200 if is_ready else 503
+
+    return api
@@ -0,0 +1,22 @@
+"""Dependency-free scam detection core.
+
+Only the standard library is used, and nothing is compiled until the first
+message is scored, so ``import scam_core`` is cheap enough for CLI and
+serverless entry points. Submodules are loaded on attribute access.
+"""
+
+_EXPORTS = {
+    'ScamDetector': 'detector',
+    'budget_stats': 'detector',
+    'get_compiled_rules': 'detector',
+    'client_bundle': 'export',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        from importlib import import_module
+        return getattr(import_module(f'.{_EXPORTS[name]}', __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
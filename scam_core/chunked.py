@@ -0,0 +1,219 @@
+"""Windowed scoring for inputs too large to scan in one piece.
+
+Text is fed in chunks of any size and cut into pieces of about ``window``
+characters, just after whitespace that normalization cannot join across, so
+normalizing piece by piece gives the same text as normalizing the whole.
+Each matcher then keeps only the tail it needs from the previous piece:
+keyword matchers the longest needle minus one character, regex matchers the
+longest span a match can have. Keyword hits are merged as a set, and a regex
+match is only counted once it starts before the overlap kept for the next
+piece, with the next search resuming where the whole-text search would, so
+nothing is counted twice and memory stays O(window) however long the input.
+
+The result equals ``CompiledRules.scan`` on the whole text as long as no
+single pattern match is longer than ``max_span``. That always holds for
+bounded patterns; those with unbounded repetition (``.*``, ``\\d+``) are
+assumed to stay within it. A stretch of ``window`` characters with no safe
+cut point is cut anyway.
+"""
+import re
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+from .detector import STAGES, CompiledRules, ScanResult, get_compiled_rules
+from .language import DEVANAGARI, FOLDS, LATIN, has_devanagari, hinglish_markers, is_hinglish
+from .normalize import normalize
+
+DEFAULT_WINDOW = 1 << 16
+DEFAULT_MAX_SPAN = 4096
+
+# Characters kept before a regex's next search position, for lookbehinds like \b
+_CONTEXT = 16
+
+# Just after a whitespace run that no spaced-letter run or space collapse can
+# cross: two or more whitespace characters, or one after a character that
+# cannot be a single spaced-out letter
+_CUT = re.compile(
+    r'(?:(?:[A-Za-z]{2}|[\u0900-\u097f,;:?!"()\[\]])[ \t\n\r\f\v]|[ \t\n\r\f\v]{2})'
+    r'[ \t\n\r\f\v]*(?=\S)'
+)
+
+
+def max_width(regex, cap: int) -> int:
+    """Longest match ``regex`` can produce, or ``cap`` if that is longer"""
+    return min(sre_parse.parse(regex.pattern, regex.flags).getwidth()[1], cap)
+
+
+class _Presence:
+    """Set of needle indexes found anywhere in a stream of text"""
+
+    def __init__(self, match, longest: int):
+        self._match = match
+        self._tail_len = max(longest - 1, 0)
+        self._tail = ''
+        self.found = set()
+
+    def feed(self, piece: str):
+        text = self._tail + piece
+        self.found.update(self._match(text))
+        self._tail = text[-self._tail_len:] if self._tail_len else ''
+
+
+class _MatchCounter:
+    """Non-overlapping match counts of several regexes over a stream of text"""
+
+    def __init__(self, regexes, overlap: int):
+        self._regexes = tuple(regexes)
+        self._overlap = overlap
+        self._buf = ''
+        self._offset = 0  # Stream position of _buf[0]
+        self._next = [0] * len(self._regexes)  # Stream position of each regex's next search
+        self.counts = [0] * len(self._regexes)
+
+    def feed(self, piece: str, final: bool = False):
+        buf = self._buf + piece
+        offset = self._offset
+        # Matches starting at or after the cutoff may need text not seen yet
+        cutoff = len(buf) if final else len(buf) - self._overlap
+        next_pos = self._next
+        counts = self.counts
+        for i, regex in enumerate(self._regexes):
+            pos = next_pos[i] - offset
+            for match in regex.finditer(buf, pos):
+                if match.start() >= cutoff:
+                    break
+                counts[i] += 1
+                pos = match.end()
+            next_pos[i] = offset + max(pos, cutoff)
+        keep = max(min(next_pos, default=offset + len(buf)) - offset - _CONTEXT, 0)
+        self._buf = buf[keep:]
+        self._offset = offset + keep
+
+
+class ChunkedScanner:
+    """Incremental scan of one long text, fed with ``feed`` and scored with ``result``"""
+
+    def __init__(self, rules: CompiledRules = None, window: int = DEFAULT_WINDOW,
+                 max_span: int = DEFAULT_MAX_SPAN):
+        if window < 2 * max_span:
+            raise ValueError("window must be at least twice max_span")
+        self.rules = rules = rules or get_compiled_rules()
+        self.window = window
+        self._raw = ''
+        self._length = 0
+        self._exclamations = 0
+        self._upper = 0
+        self._devanagari = False
+        self._markers = set()
+
+        keywords = rules.scam_keywords
+        self._keywords = _Presence(
+            keywords.match, max((len(keywords.needle(i)) for i in range(len(keywords))), default=0)
+        )
+        urgency_words = rules.urgency_words
+        self._urgency = _Presence(
+            lambda text: [word for word in urgency_words if word in text],
+            max(map(len, urgency_words), default=0)
+        )
+        self._languages = [
+            (script, _Presence(table.match, max((len(table.needle(i)) for i in range(len(table))), default=0)))
+            for _, script, table, _ in rules.language_packs
+        ]
+        self._scripts = sorted({script for script, _ in self._languages})
+        regexes = [regex for _, regex, _ in rules.suspicious_patterns]
+        self._patterns = _MatchCounter(
+            regexes, max((max_width(regex, max_span) for regex in regexes), default=0)
+        )
+        regexes = [regex for regex, _ in rules.legitimate_patterns]
+        self._legitimate = _MatchCounter(
+            regexes, max((max_width(regex, max_span) for regex in regexes), default=0)
+        )
+
+    def _cut_point(self, raw: str, start: int) -> int:
+        """Last safe cut in the second half of the window, preferring its end"""
+        end = start + self.window
+        for lookback in (self.window // 16, self.window // 2):
+            cut = None
+            for match in _CUT.finditer(raw, end - lookback, end):
+                cut = match.end()
+            if cut is not None:
+                return cut
+        return end
+
+    def feed(self, chunk: str):
+        raw = self._raw + chunk
+        start = 0
+        while len(raw) - start >= self.window:
+            cut = self._cut_point(raw, start)
+            self._process(raw[start:cut], False)
+            start = cut
+        self._raw = raw[start:]
+
+    def _process(self, piece: str, final: bool):
+        self._length += len(piece)
+        self._exclamations += piece.count('!')
+        self._upper += sum(map(str.isupper, piece))
+        self._patterns.feed(piece, final)
+
+        normalized = normalize(piece)
+        self._keywords.feed(normalized)
+        self._urgency.feed(normalized)
+        self._legitimate.feed(normalized, final)
+        if not self._devanagari:
+            self._devanagari = has_devanagari(normalized)
+        hinglish_markers(normalized, self._markers)
+        # Language packs only count if their script is detected somewhere in
+        # the text, which is not known until the end, so all are matched
+        folded = {script: FOLDS[script](normalized) for script in self._scripts}
+        for script, presence in self._languages:
+            presence.feed(folded[script])
+
+    def result(self) -> ScanResult:
+        """Score everything fed so far; the scanner is finished afterwards"""
+        self._process(self._raw, True)
+        self._raw = ''
+        rules = self.rules
+        fired = [(i, 1) for i in self._keywords.found]
+        fired.extend(
+            (rules._pattern_base + i, count)
+            for i, count in enumerate(self._patterns.counts) if count
+        )
+        fired.extend(
+            (rules._legitimate_base + i, count)
+            for i, count in enumerate(self._legitimate.counts) if count
+        )
+        if self._exclamations > rules.exclamation_threshold:
+            fired.append((rules.exclamation_id, self._exclamations))
+        caps_ratio = self._upper / max(self._length, 1)
+        if caps_ratio > rules.caps_ratio_threshold:
+            fired.append((rules.caps_ratio_id, caps_ratio))
+        if self._urgency.found:
+            fired.append((rules.urgency_id, len(self._urgency.found)))
+        scripts = set()
+        if self._devanagari:
+            scripts.add(DEVANAGARI)
+        if is_hinglish(self._markers):
+            scripts.add(LATIN)
+        for (_, script, _, base), (_, presence) in zip(rules.language_packs, self._languages):
+            if script in scripts:
+                fired.extend((base + i, 1) for i in presence.found)
+        return rules.result(fired, STAGES)
+
+
+def scan_chunks(chunks, rules: CompiledRules = None, window: int = DEFAULT_WINDOW,
+                max_span: int = DEFAULT_MAX_SPAN) -> ScanResult:
+    """Score the concatenation of ``chunks`` in O(window) memory"""
+    scanner = ChunkedScanner(rules, window, max_span)
+    for chunk in chunks:
+        scanner.feed(chunk)
+    return scanner.result()
+
+
+def scan_file(path: str, rules: CompiledRules = None, window: int = DEFAULT_WINDOW,
+              max_span: int = DEFAULT_MAX_SPAN, encoding: str = 'utf-8') -> ScanResult:
+    """Score a text file without reading it into memory whole"""
+    with open(path, 'r', encoding=encoding, errors='replace') as f:
+        return scan_chunks(iter(lambda: f.read(window), ''), rules, window, max_span)
@@ -0,0 +1,153 @@
+"""Conversation-level scoring over a bounded in-memory session store.
+
+A scam often spreads its signals over several messages (rapport, then
+urgency, then a payment request), so each one alone looks mild. The store
+keeps, per conversation, the strongest value seen for every rule and the raw
+score those values add up to. A new message only touches the rules it fired,
+so the update costs the same however long the thread is. With a model, the
+highest scam probability seen is blended into the conversation score the
+same way ``ScamDetector`` blends it into a message's.
+
+Conversations are evicted least-recently-updated first when the store holds
+too many or exceeds its memory cap, and lazily once idle for longer than the
+TTL.
+"""
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from .detector import ScamDetector, ScanResult
+
+
+class ConversationState:
+    __slots__ = ('rules', 'features', 'raw_score', 'probability', 'messages', 'updated_at', 'size')
+
+    def __init__(self, rules, now: float):
+        self.rules = rules
+        self.features = {}  # rule id -> strongest value seen so far
+        self.raw_score = 0.0
+        self.probability = None  # Highest model probability seen so far
+        self.messages = 0
+        self.updated_at = now
+        self.size = 0
+
+    def update(self, result: ScanResult):
+        """Fold one message's fired rules into the aggregate, in place"""
+        weight_of = self.rules.weight_of
+        features = self.features
+        for rule_id, value in zip(result.rule_ids, result.values):
+            old = features.get(rule_id, 0)
+            if value > old:
+                features[rule_id] = value
+                self.raw_score += (value - old) * weight_of(rule_id)
+        if result.probability is not None and (self.probability is None
+                                               or result.probability > self.probability):
+            self.probability = result.probability
+        self.messages += 1
+
+    def result(self, detector: ScamDetector = None) -> ScanResult:
+        """Aggregate result, with the model blended in by ``detector`` when there is one"""
+        rules = self.rules
+        score = min((self.raw_score / rules.max_possible_score) * 100, 100)
+        rule_ids = tuple(sorted(self.features))
+        result = ScanResult(rules, score, rule_ids, tuple(self.features[i] for i in rule_ids))
+        if detector is not None and self.probability is not None:
+            result.score = detector.blended(score, self.probability)
+            result.probability = self.probability
+        return result
+
+
+# Rough per-entry overhead of the OrderedDict slot and the id string
+_ENTRY_OVERHEAD = 160
+
+
+class ConversationStore:
+    """Thread-safe LRU + TTL store of conversation states with a memory cap"""
+
+    def __init__(self, detector: ScamDetector = None, max_conversations: int = 500_000,
+                 ttl_seconds: float = 3600.0, max_bytes: int = 256 * 2**20):
+        self.detector = detector or ScamDetector()
+        self.max_conversations = max_conversations
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._states = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes_used = 0
+        self.evicted = {'lru': 0, 'ttl': 0, 'memory': 0}
+
+    def add_message(self, conversation_id: str, text: str) -> dict:
+        """Score ``text`` and fold it into its conversation"""
+        result = self.detector.scan(text)
+        response = self.add_scan(conversation_id, result)
+        response['message'] = result.to_dict()
+        return response
+
+    def add_scan(self, conversation_id: str, result: ScanResult) -> dict:
+        """Fold an already computed message result into its conversation"""
+        now = time.monotonic()
+        with self._lock:
+            state = self._states.pop(conversation_id, None)
+            if state is not None:
+                self.bytes_used -= state.size
+                if state.rules is not result.rules or now - state.updated_at > self.ttl_seconds:
+                    # Rule pack changed or the thread went stale: start over
+                    state = None
+            if state is None:
+                state = ConversationState(result.rules, now)
+            state.update(result)
+            state.updated_at = now
+            state.size = _ENTRY_OVERHEAD + sys.getsizeof(state) + sys.getsizeof(state.features) \
+                + sys.getsizeof(conversation_id)
+            self._states[conversation_id] = state
+            self.bytes_used += state.size
+            self._evict(now)
+            return self._response(conversation_id, state)
+
+    def get(self, conversation_id: str) -> dict:
+        with self._lock:
+            state = self._states.get(conversation_id)
+            if state is None or time.monotonic() - state.updated_at > self.ttl_seconds:
+                return None
+            return self._response(conversation_id, state)
+
+    def end(self, conversation_id: str) -> bool:
+        with self._lock:
+            state = self._states.pop(conversation_id, None)
+            if state is None:
+                return False
+            self.bytes_used -= state.size
+            return True
+
+    def _evict(self, now: float):
+        states = self._states
+        # Oldest updates sit at the front, so expired entries are found there first
+        while states:
+            oldest_id = next(iter(states))
+            oldest = states[oldest_id]
+            if now - oldest.updated_at > self.ttl_seconds:
+                reason = 'ttl'
+            elif len(states) > self.max_conversations:
+                reason = 'lru'
+            elif self.bytes_used > self.max_bytes:
+                reason = 'memory'
+            else:
+                break
+            del states[oldest_id]
+            self.bytes_used -= oldest.size
+            self.evicted[reason] += 1
+
+    def _response(self, conversation_id: str, state: ConversationState) -> dict:
+        response = state.result(self.detector).to_dict()
+        response['conversation_id'] = conversation_id
+        response['messages'] = state.messages
+        return response
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'conversations': len(self._states),
+                'bytes_used': self.bytes_used,
+                'max_bytes': self.max_bytes,
+                'evicted': dict(self.evicted),
+            }
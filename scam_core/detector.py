@@ -0,0 +1,568 @@
+"""Rule-based scam detector.
+
+The rule tables in ``scam_core.rules`` are compiled once per process, on the
+first call that needs them, and shared by every ``ScamDetector`` instance.
+Detectors built from a custom rule pack compile their own copy, and
+detectors attached to a published segment (see ``scam_core.shared``) read
+their keyword table from shared memory.
+"""
+import re
+import threading
+from operator import itemgetter
+from time import perf_counter
+
+from . import rules
+from .language import FOLDS, detect_scripts, trie_pattern
+from .normalize import normalize
+
+# Rule stages in the order they run, cheapest first
+STAGES = ('urgency', 'keywords', 'languages', 'characteristics', 'legitimate', 'patterns', 'span_patterns')
+# Runs after the rule stages when a detector has a model
+MODEL_STAGE = 'model'
+
+_compiled = None
+_compile_lock = threading.Lock()
+
+
+class KeywordTable:
+    """Weighted keywords matched as substrings of the normalized text.
+
+    Iterating yields ``(keyword, weight)`` pairs in rule order; ``match``
+    returns the indexes of the keywords present, in ascending order.
+    Keywords are normalized the same way as the text they are matched
+    against, so a keyword like '24 hours' still matches. By default matching
+    is one substring search per keyword, so its cost grows with the table;
+    ``indexed`` tables match through a ``PrefixIndex`` instead.
+    """
+
+    def __init__(self, items, fold=None, indexed: bool = False):
+        items = tuple(items)
+        self._keywords = tuple(keyword for keyword, _ in items)
+        self._weights = tuple(weight for _, weight in items)
+        needles = (normalize(keyword) for keyword in self._keywords)
+        if fold is not None:
+            needles = (fold(needle) for needle in needles)
+        self._needles = tuple(needles)
+        for keyword, needle in zip(self._keywords, self._needles):
+            # An empty needle is "in" every text
+            if not needle:
+                raise ValueError(f"keyword {keyword!r} is empty after normalization")
+        self._index = PrefixIndex(self._needles) if indexed and self._needles else None
+
+    def __len__(self):
+        return len(self._keywords)
+
+    def __iter__(self):
+        return zip(self._keywords, self._weights)
+
+    def keyword(self, index: int) -> str:
+        return self._keywords[index]
+
+    def needle(self, index: int) -> str:
+        """The keyword as matched, after normalization and folding"""
+        return self._needles[index]
+
+    def weight(self, index: int) -> float:
+        return self._weights[index]
+
+    def match(self, normalized: str) -> list:
+        if self._index is not None:
+            return self._index.match(normalized)
+        return [i for i, needle in enumerate(self._needles) if needle in normalized]
+
+
+class PrefixIndex:
+    """Substring matcher whose cost follows the text and its hits, not the table size.
+
+    Needles are grouped by their first few characters. One regex pass, a
+    prefix tree over those prefixes run by the C engine, finds every
+    position where some needle could start; only the needles sharing that
+    prefix are then compared there. A few microseconds slower than plain
+    substring searches on a 20-keyword table, about 25x faster at 5000
+    keywords (see ``benchmarks/language_bench.py``).
+    """
+
+    PREFIX = 3
+
+    def __init__(self, needles):
+        self._prefix = min(self.PREFIX, min(map(len, needles)))
+        self._by_prefix = {}  # prefix -> [(index, needle)]
+        for index, needle in enumerate(needles):
+            self._by_prefix.setdefault(needle[:self._prefix], []).append((index, needle))
+        # Zero-width, so overlapping and nested candidates are all found
+        self._starts = re.compile('(?=(' + trie_pattern(self._by_prefix) + '))')
+
+    def match(self, normalized: str) -> list:
+        found = set()
+        by_prefix = self._by_prefix
+        startswith = normalized.startswith
+        for candidate in self._starts.finditer(normalized):
+            position = candidate.start()
+            for index, needle in by_prefix[candidate.group(1)]:
+                if index not in found and startswith(needle, position):
+                    found.add(index)
+        return sorted(found)
+
+
+class CompiledRules:
+    """Regexes and keyword tables ready for scoring"""
+
+    def __init__(self, pack: dict = None, keyword_table=None):
+        if pack is None:
+            pack = rules.default_rule_pack()
+        self.version = pack['version']
+        if keyword_table is None:
+            keyword_table = KeywordTable(pack['scam_keywords'].items())
+        self.scam_keywords = keyword_table
+        self.suspicious_patterns = tuple(
+            (pattern, re.compile(pattern, re.IGNORECASE), weight)
+            for pattern, weight in pack['suspicious_patterns']
+        )
+        self.legitimate_patterns = tuple(
+            (re.compile(pattern), weight)
+            for pattern, weight in pack['legitimate_patterns']
+        )
+        self.urgency_words = tuple(normalize(word) for word in pack['urgency_words'])
+        self.urgency_weight = pack['urgency_weight']
+        self.exclamation_threshold = pack['exclamation_threshold']
+        self.exclamation_weight = pack['exclamation_weight']
+        self.caps_ratio_threshold = pack['caps_ratio_threshold']
+        self.caps_ratio_weight = pack['caps_ratio_weight']
+        # Only used for email; packs saved before it existed fall back to the default
+        self.link_mismatch_weight = pack.get('link_mismatch_weight', rules.LINK_MISMATCH_WEIGHT)
+        self.max_possible_score = pack['max_possible_score']
+        self.scam_threshold = pack['scam_threshold']
+        self.risk_bands = tuple(tuple(band) for band in pack['risk_bands'])
+
+        # Feature ids index ``feature_names()``/``weights()``; these mark where
+        # each rule group starts so ids can be mapped back to their rule
+        self._pattern_base = len(self.scam_keywords)
+        self._legitimate_base = self._pattern_base + len(self.suspicious_patterns)
+        self.exclamation_id = self._legitimate_base + len(self.legitimate_patterns)
+        self.caps_ratio_id = self.exclamation_id + 1
+        self.urgency_id = self.exclamation_id + 2
+        # Language packs go last so adding one never renumbers other rules
+        self._language_base = self.urgency_id + 1
+        language_packs = []
+        base = self._language_base
+        for tag, lang in pack.get('language_packs', {}).items():
+            table = KeywordTable(lang['scam_keywords'].items(), fold=FOLDS[lang['script']], indexed=True)
+            language_packs.append((tag, lang['script'], table, base))
+            base += len(table)
+        self.language_packs = tuple(language_packs)
+        self._language_keywords = tuple(
+            keyword for _, _, table, _ in self.language_packs for keyword, _ in table
+        )
+        self.n_features = base
+        # Keyword weights stay in the keyword table, which may be large
+        self._rule_weights = tuple(self.weights()[self._pattern_base:])
+        self._pattern_reasons = tuple(
+            f"Matches suspicious pattern: {pattern}" for pattern, _, _ in self.suspicious_patterns
+        )
+
+    def feature_names(self) -> list:
+        """Names of the columns returned by ``features``, in order"""
+        return (
+            [f"keyword:{keyword}" for keyword, _ in self.scam_keywords]
+            + [f"pattern:{pattern}" for pattern, _, _ in self.suspicious_patterns]
+            + [f"legitimate:{regex.pattern}" for regex, _ in self.legitimate_patterns]
+            + ['exclamations', 'caps_ratio', 'urgency']
+            + [f"keyword[{tag}]:{keyword}"
+               for tag, _, table, _ in self.language_packs for keyword, _ in table]
+        )
+
+    def weights(self) -> list:
+        """Weight of each feature; the raw score is ``dot(features, weights)``"""
+        return (
+            [weight for _, weight in self.scam_keywords]
+            + [weight for _, _, weight in self.suspicious_patterns]
+            + [weight for _, weight in self.legitimate_patterns]
+            + [self.exclamation_weight, self.caps_ratio_weight, self.urgency_weight]
+            + [weight for _, _, table, _ in self.language_packs for _, weight in table]
+        )
+
+    def feature_name(self, rule_id: int) -> str:
+        """``feature_names()[rule_id]``, without building the whole list"""
+        if rule_id < self._pattern_base:
+            return f"keyword:{self.scam_keywords.keyword(rule_id)}"
+        if rule_id < self._legitimate_base:
+            return f"pattern:{self.suspicious_patterns[rule_id - self._pattern_base][0]}"
+        if rule_id < self.exclamation_id:
+            return f"legitimate:{self.legitimate_patterns[rule_id - self._legitimate_base][0].pattern}"
+        if rule_id < self._language_base:
+            return ('exclamations', 'caps_ratio', 'urgency')[rule_id - self.exclamation_id]
+        for tag, _, table, base in self.language_packs:
+            if rule_id < base + len(table):
+                return f"keyword[{tag}]:{table.keyword(rule_id - base)}"
+        raise IndexError(f"rule id {rule_id} out of range")
+
+    def weight_of(self, rule_id: int) -> float:
+        if rule_id < self._pattern_base:
+            return self.scam_keywords.weight(rule_id)
+        return self._rule_weights[rule_id - self._pattern_base]
+
+    def _stage_languages(self, text, normalized, fired):
+        if not self.language_packs:
+            return
+        scripts = detect_scripts(normalized)
+        folded = {}
+        for _, script, table, base in self.language_packs:
+            if script in scripts:
+                if script not in folded:
+                    folded[script] = FOLDS[script](normalized)
+                fired.extend((base + i, 1) for i in table.match(folded[script]))
+
+    def _stage_characteristics(self, text, normalized, fired):
+        exclamation_count = text.count('!')
+        if exclamation_count > self.exclamation_threshold:
+            fired.append((self.exclamation_id, exclamation_count))
+        caps_ratio = sum(map(str.isupper, text)) / max(len(text), 1)
+        if caps_ratio > self.caps_ratio_threshold:
+            fired.append((self.caps_ratio_id, caps_ratio))
+
+    def _stage_keywords(self, text, normalized, fired):
+        fired.extend((i, 1) for i in self.scam_keywords.match(normalized))
+
+    def _stage_urgency(self, text, normalized, fired):
+        urgency_count = sum(1 for word in self.urgency_words if word in normalized)
+        if urgency_count > 0:
+            fired.append((self.urgency_id, urgency_count))
+
+    def _stage_legitimate(self, text, normalized, fired):
+        base = self._legitimate_base
+        for i, (regex, _) in enumerate(self.legitimate_patterns):
+            count = len(regex.findall(normalized))
+            if count:
+                fired.append((base + i, count))
+
+    def _run_patterns(self, text, fired, span):
+        base = self._pattern_base
+        for i, (pattern, regex, _) in enumerate(self.suspicious_patterns):
+            if ('.*' in pattern) == span:
+                count = len(regex.findall(text))
+                if count:
+                    fired.append((base + i, count))
+
+    def _stage_patterns(self, text, normalized, fired):
+        self._run_patterns(text, fired, span=False)
+
+    def _stage_span_patterns(self, text, normalized, fired):
+        # Patterns with '.*' can scan the rest of the text per match attempt
+        self._run_patterns(text, fired, span=True)
+
+    def scan(self, text: str, deadline: float = None, timings: dict = None) -> 'ScanResult':
+        """Run the rule stages over ``text``, cheapest first.
+
+        With a ``deadline`` (a ``time.perf_counter()`` value), stages that
+        would start after it are skipped and the result is marked partial.
+        If ``timings`` is given, the seconds spent normalizing and in each
+        stage are stored in it by name.
+        """
+        if timings is not None:
+            start = perf_counter()
+        # Normalized once and shared by every word-level stage
+        normalized = normalize(text)
+        fired = []
+        stages_run = []
+        if timings is not None:
+            timings['normalize'] = perf_counter() - start
+        for name in STAGES:
+            if deadline is not None and perf_counter() >= deadline:
+                break
+            if timings is not None:
+                start = perf_counter()
+                getattr(self, '_stage_' + name)(text, normalized, fired)
+                timings[name] = perf_counter() - start
+            else:
+                getattr(self, '_stage_' + name)(text, normalized, fired)
+            stages_run.append(name)
+        return self.result(fired, tuple(stages_run))
+
+    def result(self, fired: list, stages: tuple = STAGES) -> 'ScanResult':
+        """Score a list of ``(rule_id, value)`` pairs, sorting it in place"""
+        # Sum in rule order so the score does not depend on stage order
+        fired.sort(key=itemgetter(0))
+        weight_of = self.weight_of
+        score = 0.0
+        for rule_id, value in fired:
+            score += value * weight_of(rule_id)
+        normalized_score = min((score / self.max_possible_score) * 100, 100)
+        return ScanResult(
+            self, normalized_score,
+            tuple(rule_id for rule_id, _ in fired),
+            tuple(value for _, value in fired),
+            stages
+        )
+
+    def features(self, text: str) -> list:
+        """Dense per-rule feature row for ``text``"""
+        row = [0.0] * self.n_features
+        result = self.scan(text)
+        for rule_id, value in zip(result.rule_ids, result.values):
+            row[rule_id] = float(value)
+        return row
+
+    def reason(self, rule_id: int, value) -> str:
+        """Human-readable reason for a fired rule, or None for rules that lower the score"""
+        if rule_id < self._pattern_base:
+            return f"Contains suspicious keyword: '{self.scam_keywords.keyword(rule_id)}'"
+        if rule_id < self._legitimate_base:
+            return self._pattern_reasons[rule_id - self._pattern_base]
+        if rule_id == self.exclamation_id:
+            return f"Excessive exclamation marks ({value})"
+        if rule_id == self.caps_ratio_id:
+            return f"High percentage of capital letters ({value:.1%})"
+        if rule_id == self.urgency_id:
+            return f"Contains {value} urgency indicators"
+        if rule_id >= self._language_base:
+            return f"Contains suspicious keyword: '{self._language_keywords[rule_id - self._language_base]}'"
+        return None
+
+    def risk_band(self, normalized_score: float):
+        """Return ``(risk_level, color)`` for a 0-100 score"""
+        for threshold, risk_level, color in self.risk_bands:
+            if normalized_score >= threshold:
+                return risk_level, color
+        return self.risk_bands[-1][1], self.risk_bands[-1][2]
+
+
+class ScanResult:
+    """Compact scoring result: fired rule ids and their counts.
+
+    Reason strings and the API dict are only built when asked for, so batch
+    callers that just need the score do not pay for them.
+    """
+
+    __slots__ = ('rules', 'score', 'rule_ids', 'values', 'stages', 'planned', 'probability')
+
+    def __init__(self, rules: CompiledRules, score: float, rule_ids: tuple, values: tuple,
+                 stages: tuple = STAGES, planned: tuple = STAGES):
+        self.rules = rules
+        self.score = score
+        self.rule_ids = rule_ids
+        self.values = values
+        self.stages = stages
+        self.planned = planned  # Stages a full scan runs
+        self.probability = None  # Model scam probability, once blended in
+
+    @property
+    def partial(self) -> bool:
+        """True when a latency budget cut the scan short"""
+        return len(self.stages) < len(self.planned)
+
+    @property
+    def is_scam(self) -> bool:
+        return self.score >= self.rules.scam_threshold
+
+    def risk(self):
+        """Return ``(risk_level, color)``"""
+        return self.rules.risk_band(self.score)
+
+    def reasons(self, limit: int = 5) -> list:
+        """Reasons for the fired rules, largest score contribution first"""
+        weight_of = self.rules.weight_of
+        ranked = sorted(
+            (-weight_of(rule_id) * value, position, rule_id, value)
+            for position, (rule_id, value) in enumerate(zip(self.rule_ids, self.values))
+        )
+        reasons = []
+        for contribution, _, rule_id, value in ranked:
+            if len(reasons) == limit or contribution >= 0:
+                break
+            reasons.append(self.rules.reason(rule_id, value))
+        return reasons
+
+    def to_dict(self) -> dict:
+        risk_level, color = self.risk()
+        return {
+            "score": round(self.score, 1),
+            "risk_level": risk_level,
+            "color": color,
+            "reasons": self.reasons(),
+            "is_scam": self.is_scam
+        }
+
+
+def get_compiled_rules() -> CompiledRules:
+    """Return the shared compiled default rules, building them on first use"""
+    global _compiled
+    if _compiled is None:
+        with _compile_lock:
+            if _compiled is None:
+                _compiled = CompiledRules()
+    return _compiled
+
+
+class BudgetStats:
+    """Process-wide counters for latency-budgeted requests"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.budgeted = 0
+        self.degraded = 0  # Returned a partial score
+        self.overruns = 0  # Finished after the deadline
+
+    def record(self, partial: bool, overran: bool):
+        with self._lock:
+            self.budgeted += 1
+            self.degraded += partial
+            self.overruns += overran
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                'budgeted': self.budgeted,
+                'degraded': self.degraded,
+                'overruns': self.overruns,
+            }
+
+
+budget_stats = BudgetStats()
+
+
+class ScamDetector:
+    """Rule-based scorer, optionally blended with a hashed n-gram model.
+
+    ``model`` is a ``scam_core.hashed.HashedModel`` or the path of a saved
+    one. Its scam probability (as 0-100) is mixed into the rule score with
+    weight ``model_blend``: 0 keeps the rules alone, 1 uses the model alone.
+
+    ``shared_rules`` is the path of a segment published with
+    ``scam_core.shared.publish_rule_pack``. Its keyword matching costs grow
+    with message size instead of table size: slower than the private table
+    for the default pack, faster only for tables of many thousands of
+    keywords.
+    """
+
+    def __init__(self, rule_pack: dict = None, shared_rules: str = None, model=None,
+                 model_blend: float = 0.5):
+        self._rule_pack = rule_pack
+        self._rules = None
+        self._shared = None
+        if shared_rules is not None:
+            from .shared import SharedRules
+            self._shared = SharedRules(shared_rules)
+        if isinstance(model, str):
+            from .hashed import HashedModel
+            model = HashedModel.load(model)
+        if not 0.0 <= model_blend <= 1.0:
+            raise ValueError("model_blend must be between 0 and 1")
+        self.model = model
+        self.model_blend = model_blend
+
+    @property
+    def rules(self) -> CompiledRules:
+        if self._shared is not None:
+            return self._shared.current()
+        if self._rules is None:
+            if self._rule_pack is None:
+                self._rules = get_compiled_rules()
+            else:
+                self._rules = CompiledRules(self._rule_pack)
+        return self._rules
+
+    # Read-only views kept for callers that inspected the old attributes
+    @property
+    def scam_keywords(self) -> dict:
+        return dict(self.rules.scam_keywords)
+
+    @property
+    def suspicious_patterns(self):
+        return [pattern for pattern, _, _ in self.rules.suspicious_patterns]
+
+    @property
+    def legitimate_patterns(self):
+        return [regex.pattern for regex, _ in self.rules.legitimate_patterns]
+
+    def scan(self, text: str, budget_ms: float = None, timings: dict = None) -> ScanResult:
+        """Score ``text`` and return the compact result object.
+
+        ``budget_ms`` bounds the time spent and ``timings`` collects
+        per-stage seconds; see ``CompiledRules.scan``.
+        """
+        if budget_ms is None:
+            result = self.rules.scan(text, timings=timings)
+            if self.model is not None:
+                self._stage_model(result, text, timings)
+            return result
+        deadline = perf_counter() + budget_ms / 1000.0
+        result = self.rules.scan(text, deadline, timings)
+        if self.model is not None:
+            # The model is the last stage: skipped, leaving the result
+            # partial, once the budget is spent
+            result.planned = STAGES + (MODEL_STAGE,)
+            if perf_counter() < deadline:
+                self._stage_model(result, text, timings)
+        budget_stats.record(result.partial, perf_counter() > deadline)
+        return result
+
+    def _stage_model(self, result: ScanResult, text: str, timings: dict = None):
+        if timings is not None:
+            start = perf_counter()
+            self._blend(result, self.model.probability(text))
+            timings[MODEL_STAGE] = perf_counter() - start
+        else:
+            self._blend(result, self.model.probability(text))
+
+    def blended(self, score: float, probability: float) -> float:
+        """Rule score (0-100) mixed with a model scam probability"""
+        blend = self.model_blend
+        return (1.0 - blend) * score + blend * probability * 100
+
+    def _blend(self, result: ScanResult, probability: float):
+        result.score = self.blended(result.score, probability)
+        result.probability = probability
+        result.stages += (MODEL_STAGE,)
+        result.planned = STAGES + (MODEL_STAGE,)
+
+    def scan_batch(self, texts) -> list:
+        """Score many texts, returning one ``ScanResult`` per text"""
+        scan = self.rules.scan
+        if self.model is None:
+            return [scan(text) for text in texts]
+        texts = list(texts)
+        results = [scan(text) for text in texts]
+        for result, probability in zip(results, self.model.probability_batch(texts)):
+            self._blend(result, probability)
+        return results
+
+    def scan_chunks(self, chunks, **options) -> ScanResult:
+        """Score a text too large to hold at once, given as an iterable of chunks.
+
+        Rules only: the model needs the whole text, so it is not blended in
+        and the result's ``stages`` do not include ``MODEL_STAGE``.
+        ``options`` are passed to ``scam_core.chunked.scan_chunks``.
+        """
+        from .chunked import scan_chunks
+        return scan_chunks(chunks, self.rules, **options)
+
+    def calculate_scam_score(self, text: str) -> dict:
+        """Calculate scam probability score for given text"""
+        return self.scan(text).to_dict()
+
+    def analyze_text(self, text: str, budget_ms: float = None) -> dict:
+        """Main method to analyze text for scam detection.
+
+        With ``budget_ms``, the response also carries ``partial`` and the
+        ``stages`` that ran before the budget was spent.
+        """
+        if not text.strip():
+            return {
+                "score": 0,
+                "risk_level": "NO TEXT",
+                "color": "gray",
+                "reasons": ["No text provided"],
+                "is_scam": False
+            }
+
+        if budget_ms is None:
+            return self.calculate_scam_score(text)
+        return self.response(self.scan(text, budget_ms), budgeted=True)
+
+    def response(self, result: ScanResult, budgeted: bool = False) -> dict:
+        """``analyze_text`` response for a scan result"""
+        response = result.to_dict()
+        if budgeted:
+            response["partial"] = result.partial
+            response["stages"] = list(result.stages)
+        return response
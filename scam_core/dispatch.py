@@ -0,0 +1,239 @@
+"""Cache-affinity dispatcher for a pool of scoring processes.
+
+Each worker process keeps its own LRU cache of results. Messages are routed
+by consistent hashing of their normalized content, so repeated copies of the
+same message land on the same worker and hit its cache. Adding or removing
+a worker only moves the keys that hashed to that worker's ring points.
+
+The caches are keyed by the exact text, not the routing key: case,
+punctuation and symbols feed rules that score the raw text, so copies that
+normalize alike still get their own verdict, scored on the same worker.
+
+A worker process that dies is restarted under the same id, so the ring does
+not change, and the requests it held are sent to its replacement once. Each
+worker answers on its own pipe: a process killed while writing to a shared
+queue would leave the queue's lock held and block every other worker.
+"""
+import bisect
+import hashlib
+import itertools
+import multiprocessing
+import time
+from collections import OrderedDict
+from multiprocessing.connection import wait
+
+from .normalize import normalize
+
+VIRTUAL_NODES = 64
+POLL_INTERVAL = 0.5  # Seconds between worker liveness checks while waiting
+MAX_ATTEMPTS = 2  # Workers a request may be sent to before the batch fails
+
+
+def routing_key(text: str) -> bytes:
+    """Key used to pick a worker: the normalized text, so obfuscated copies route together"""
+    return normalize(text).encode('utf-8')
+
+
+def _hash(data: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'big')
+
+
+class HashRing:
+    """Consistent hash ring with virtual nodes"""
+
+    def __init__(self, virtual_nodes: int = VIRTUAL_NODES):
+        self.virtual_nodes = virtual_nodes
+        self._points = []
+        self._owners = []
+
+    def add(self, node):
+        for replica in range(self.virtual_nodes):
+            point = _hash(f"{node}#{replica}".encode('utf-8'))
+            index = bisect.bisect(self._points, point)
+            self._points.insert(index, point)
+            self._owners.insert(index, node)
+
+    def remove(self, node):
+        keep = [(p, o) for p, o in zip(self._points, self._owners) if o != node]
+        self._points = [p for p, _ in keep]
+        self._owners = [o for _, o in keep]
+
+    def lookup(self, key: bytes):
+        if not self._points:
+            raise LookupError("hash ring is empty")
+        index = bisect.bisect(self._points, _hash(key)) % len(self._points)
+        return self._owners[index]
+
+
+def _worker_main(requests, responses, cache_size: int, rule_pack, shared_rules):
+    from .detector import ScamDetector
+
+    detector = ScamDetector(rule_pack=rule_pack, shared_rules=shared_rules)
+    cache = OrderedDict()
+    while True:
+        job = requests.get()
+        if job is None:
+            break
+        request_id, text = job
+        result = cache.get(text)
+        hit = result is not None
+        if hit:
+            cache.move_to_end(text)
+        else:
+            result = detector.analyze_text(text)
+            cache[text] = result
+            if len(cache) > cache_size:
+                cache.popitem(last=False)
+        responses.send((request_id, result, hit))
+
+
+class ScoringPool:
+    """Scoring processes behind a consistent-hash or round-robin router"""
+
+    def __init__(self, workers: int = None, routing: str = 'consistent',
+                 cache_size: int = 10000, rule_pack: dict = None, shared_rules: str = None,
+                 timeout: float = None):
+        if routing not in ('consistent', 'round_robin'):
+            raise ValueError(f"unknown routing {routing!r}")
+        self.routing = routing
+        self.cache_size = cache_size
+        self.timeout = timeout  # Default for score_many; None waits for as long as workers live
+        self._worker_args = (rule_pack, shared_rules)
+        self._ctx = multiprocessing.get_context('spawn')
+        self._workers = {}
+        self._ring = HashRing()
+        self._round_robin = None
+        self._next_worker_id = itertools.count()
+        self._next_request_id = itertools.count()
+        self.hits = 0
+        self.misses = 0
+        for _ in range(workers or multiprocessing.cpu_count()):
+            self.add_worker()
+
+    def _start(self, worker_id):
+        requests = self._ctx.Queue()
+        responses, writer = self._ctx.Pipe(duplex=False)
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(requests, writer, self.cache_size) + self._worker_args,
+            daemon=True
+        )
+        process.start()
+        writer.close()  # So the pipe reports EOF once the worker is gone
+        self._workers[worker_id] = (process, requests, responses)
+
+    def add_worker(self):
+        worker_id = next(self._next_worker_id)
+        self._start(worker_id)
+        self._ring.add(worker_id)
+        self._round_robin = itertools.cycle(list(self._workers))
+        return worker_id
+
+    def remove_worker(self, worker_id=None):
+        if worker_id is None:
+            worker_id = next(iter(self._workers))
+        process, requests, responses = self._workers.pop(worker_id)
+        self._ring.remove(worker_id)
+        self._round_robin = itertools.cycle(list(self._workers))
+        requests.put(None)
+        process.join()
+        responses.close()
+
+    def route(self, text: str):
+        return self._route(routing_key(text))
+
+    def _route(self, key: bytes):
+        if self.routing == 'round_robin':
+            return next(self._round_robin)
+        return self._ring.lookup(key)
+
+    def _send(self, pending: dict, worker_id, position: int, text: str, key: bytes, attempt: int):
+        request_id = next(self._next_request_id)
+        pending[request_id] = (position, worker_id, text, key, attempt)
+        self._workers[worker_id][1].put((request_id, text))
+
+    def _restart_dead(self, pending: dict, closed=()):
+        """Replace dead workers, and those in ``closed``, and resend their requests"""
+        dead = {}  # worker id -> exit code
+        for worker_id, (process, requests, responses) in list(self._workers.items()):
+            if worker_id in closed or not process.is_alive():
+                process.join(1.0)
+                dead[worker_id] = process.exitcode
+                requests.close()
+                responses.close()
+                self._start(worker_id)
+        if not dead:
+            return
+        for request_id, (position, worker_id, text, key, attempt) in list(pending.items()):
+            if worker_id not in dead:
+                continue
+            del pending[request_id]
+            if attempt >= MAX_ATTEMPTS:
+                raise RuntimeError(
+                    f"message {position} lost {attempt} workers (last exit code {dead[worker_id]})"
+                )
+            self._send(pending, worker_id, position, text, key, attempt + 1)
+
+    def score_many(self, texts, timeout: float = None) -> list:
+        """Score ``texts`` across the pool, returning results in input order.
+
+        Raises ``TimeoutError`` if the batch is not done after ``timeout``
+        seconds (default: the pool's ``timeout``), and ``RuntimeError`` if
+        a message's worker dies ``MAX_ATTEMPTS`` times.
+        """
+        if timeout is None:
+            timeout = self.timeout
+        deadline = None if timeout is None else time.monotonic() + timeout
+        pending = {}  # request id -> (position, worker id, text, key, attempt)
+        results = []
+        for position, text in enumerate(texts):
+            key = routing_key(text)
+            self._send(pending, self._route(key), position, text, key, 1)
+            results.append(None)
+
+        while pending:
+            poll = POLL_INTERVAL
+            if deadline is not None:
+                poll = min(poll, max(deadline - time.monotonic(), 0.0))
+            owners = {responses: worker_id for worker_id, (_, _, responses) in self._workers.items()}
+            ready = wait(list(owners), timeout=poll)
+            if not ready:
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise TimeoutError(f"{len(pending)} messages unanswered after {timeout} s")
+                self._restart_dead(pending)
+                continue
+            closed = set()
+            for responses in ready:
+                try:
+                    request_id, result, hit = responses.recv()
+                except EOFError:
+                    closed.add(owners[responses])
+                    continue
+                job = pending.pop(request_id, None)
+                if job is None:
+                    continue  # Late answer to a resent or abandoned request
+                results[job[0]] = result
+                if hit:
+                    self.hits += 1
+                else:
+                    self.misses += 1
+            if closed:
+                self._restart_dead(pending, closed)
+        return results
+
+    def score(self, text: str) -> dict:
+        return self.score_many([text])[0]
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / max(self.hits + self.misses, 1)
+
+    def close(self):
+        while self._workers:
+            self.remove_worker()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,158 @@
+"""Non-blocking, sampled structured event log.
+
+Request handlers hand events to a bounded queue and return at once; a
+background thread serializes them as JSON lines and writes them out. When
+the queue is full the event is dropped and counted instead of blocking the
+request, and verdicts are sampled by risk level so high-volume safe traffic
+does not flood the log. Rates can be overridden from configuration with
+``parse_sample_rates``, and the destination chosen with ``event_stream``.
+"""
+import atexit
+import json
+import queue
+import random
+import sys
+import threading
+import time
+
+# Fraction of verdicts logged per risk level; errors are always logged
+DEFAULT_SAMPLE_RATES = {
+    'HIGH RISK': 1.0,
+    'MEDIUM RISK': 1.0,
+    'LOW RISK': 0.1,
+    'SAFE': 0.01,
+    'NO TEXT': 0.01,
+}
+
+_STOP = object()
+
+
+def parse_sample_rates(spec: str, rates: dict = None) -> tuple:
+    """Return ``(sample_rates, default_rate)`` from a spec like
+    ``"LOW RISK=0.5,SAFE=0.05,*=1"``; ``*`` sets the rate for other levels.
+
+    Levels not named keep their rate from ``rates`` (default:
+    ``DEFAULT_SAMPLE_RATES``).
+    """
+    rates = dict(DEFAULT_SAMPLE_RATES if rates is None else rates)
+    default_rate = 1.0
+    for item in spec.split(','):
+        if not item.strip():
+            continue
+        level, sep, value = item.partition('=')
+        if not sep:
+            raise ValueError(f"expected LEVEL=RATE, got {item.strip()!r}")
+        rate = float(value)
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError(f"sample rate for {level.strip()!r} must be between 0 and 1")
+        if level.strip() == '*':
+            default_rate = rate
+        else:
+            rates[level.strip().upper()] = rate
+    return rates, default_rate
+
+
+def event_stream(spec: str):
+    """Stream for a destination spec: 'stdout', 'stderr', a file path
+    (appended to), or 'off' for None.
+    """
+    spec = spec.strip()
+    if spec.lower() in ('', 'stdout', '-'):
+        return sys.stdout
+    if spec.lower() == 'stderr':
+        return sys.stderr
+    if spec.lower() in ('off', 'none'):
+        return None
+    return open(spec, 'a', encoding='utf-8')
+
+
+class EventLog:
+    def __init__(self, stream=None, maxsize: int = 10000, sample_rates: dict = None,
+                 default_rate: float = 1.0, flush_interval: float = 1.0):
+        self.stream = stream or sys.stdout
+        self.sample_rates = dict(DEFAULT_SAMPLE_RATES if sample_rates is None else sample_rates)
+        self.default_rate = default_rate
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._counts_lock = threading.Lock()
+        self.counts = {'enqueued': 0, 'sampled_out': 0, 'dropped': 0, 'written': 0, 'write_errors': 0}
+        self._thread = threading.Thread(target=self._drain, name='event-log', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _count(self, key: str):
+        with self._counts_lock:
+            self.counts[key] += 1
+
+    def log(self, event: str, **fields):
+        """Queue an event without blocking; drops and counts it if the queue is full"""
+        fields['event'] = event
+        fields['ts'] = time.time()
+        try:
+            self._queue.put_nowait(fields)
+        except queue.Full:
+            self._count('dropped')
+        else:
+            self._count('enqueued')
+
+    def log_verdict(self, result: dict, **fields):
+        """Log an analysis result, subject to its risk level's sample rate"""
+        rate = self.sample_rates.get(result.get('risk_level'), self.default_rate)
+        if rate < 1.0 and random.random() >= rate:
+            self._count('sampled_out')
+            return
+        self.log('verdict', sample_rate=rate, result=result, **fields)
+
+    def _drain(self):
+        last_flush = time.monotonic()
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                item = None
+            if item is _STOP:
+                break
+            if item is not None:
+                self._write(item)
+            if time.monotonic() - last_flush >= self.flush_interval:
+                self._flush()
+                last_flush = time.monotonic()
+        # Drain whatever is left before shutting down
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                self._write(item)
+        self._flush()
+
+    def _write(self, item: dict):
+        try:
+            self.stream.write(json.dumps(item, ensure_ascii=False, default=str) + '\n')
+        except Exception:
+            self._count('write_errors')
+        else:
+            self._count('written')
+
+    def _flush(self):
+        try:
+            self.stream.flush()
+        except Exception:
+            self._count('write_errors')
+
+    @property
+    def queued(self) -> int:
+        return self._queue.qsize()
+
+    def stats(self) -> dict:
+        with self._counts_lock:
+            return dict(self.counts, queued=self.queued)
+
+    def close(self, timeout: float = 2.0):
+        if self._thread.is_alive():
+            try:
+                self._queue.put(_STOP, timeout=timeout)
+            except queue.Full:
+                pass
+            self._thread.join(timeout)
@@ -0,0 +1,129 @@
+"""Client-side rule bundle for in-browser pre-scoring (see ``scorer.js``).
+
+The bundle carries everything the JavaScript scorer needs to reproduce
+``ScamDetector`` scores exactly on plain ASCII input: normalized keyword
+needles and weights, the regex sources, the characteristic thresholds, risk
+bands and the ASCII part of the normalization table. Input with other
+characters (homoglyphs, Devanagari, control characters) is left to the
+server, where Unicode regex semantics and the full normalization apply.
+
+Patterns that use Python-only regex syntax are not exported; the bundle
+lists them under ``server_only`` and the client escalates accordingly.
+"""
+import hashlib
+import json
+
+from . import language, normalize
+
+BUNDLE_FORMAT = 1
+
+# Regex constructs whose meaning differs between Python and JavaScript
+_PYTHON_ONLY = ('(?P', '(?#', '(?>', '\\A', '\\Z', '*+', '++', '?+', '}+')
+_INLINE_FLAGS = set('aiLmsux-')
+
+
+def js_compatible(pattern: str) -> bool:
+    """True if ``pattern`` means the same thing as a JavaScript regex on ASCII text"""
+    if any(token in pattern for token in _PYTHON_ONLY):
+        return False
+    in_class = False
+    escaped = False
+    for index, char in enumerate(pattern):
+        if escaped:
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        elif in_class:
+            in_class = char != ']'
+        elif char == '[':
+            in_class = True
+        elif char == '$':
+            return False  # Python's $ also matches before a trailing newline
+        elif char == '(' and pattern[index + 1:index + 2] == '?' \
+                and pattern[index + 2:index + 3] in _INLINE_FLAGS:
+            return False
+    return True
+
+
+def _ascii_table() -> dict:
+    return {
+        chr(code): (replacement or '')
+        for code, replacement in normalize._TABLE.items() if code < 128
+    }
+
+
+def build_client_bundle(compiled, server_model: bool = False) -> dict:
+    """Exportable subset of ``compiled`` as a JSON-serializable dict.
+
+    With ``server_model`` the server blends in a model the client does not
+    have, so every local score is escalated.
+    """
+    patterns = []
+    server_only = []
+    for pattern, _, weight in compiled.suspicious_patterns:
+        if js_compatible(pattern):
+            patterns.append([pattern, weight])
+        else:
+            patterns.append(None)  # keeps rule ids aligned with the server
+            server_only.append(pattern)
+    legitimate = []
+    for regex, weight in compiled.legitimate_patterns:
+        if js_compatible(regex.pattern):
+            legitimate.append([regex.pattern, weight])
+        else:
+            legitimate.append(None)
+            server_only.append(regex.pattern)
+
+    thresholds = [band[0] for band in compiled.risk_bands]
+    return {
+        'format': BUNDLE_FORMAT,
+        'version': compiled.version,
+        'normalize': {
+            'table': _ascii_table(),
+            'spaced_letters': normalize._SPACED_LETTERS.pattern,
+            'separators': normalize._SEPARATORS.pattern,
+        },
+        'hinglish': {
+            'markers': sorted(language.HINGLISH_MARKERS),
+            'strong_markers': sorted(language.HINGLISH_STRONG_MARKERS),
+            'min_markers': language.HINGLISH_MIN_MARKERS,
+            'folds': language._HINGLISH_FOLDS,
+        },
+        'keywords': [
+            [compiled.scam_keywords.needle(i), weight, keyword]
+            for i, (keyword, weight) in enumerate(compiled.scam_keywords)
+        ],
+        'patterns': patterns,
+        'legitimate': legitimate,
+        'urgency_words': list(compiled.urgency_words),
+        'urgency_weight': compiled.urgency_weight,
+        'exclamation_threshold': compiled.exclamation_threshold,
+        'exclamation_weight': compiled.exclamation_weight,
+        'caps_ratio_threshold': compiled.caps_ratio_threshold,
+        'caps_ratio_weight': compiled.caps_ratio_weight,
+        'language_packs': [
+            [tag, script, [[table.needle(i), weight, keyword] for i, (keyword, weight) in enumerate(table)]]
+            for tag, script, table, _ in compiled.language_packs
+            if script == language.LATIN  # Devanagari input is never scored locally
+        ],
+        'max_possible_score': compiled.max_possible_score,
+        'scam_threshold': compiled.scam_threshold,
+        'risk_bands': [list(band) for band in compiled.risk_bands],
+        # Scores in [low, high) are borderline and get a server verdict
+        'escalate': [0, 101] if server_model else [min(t for t in thresholds if t > 0), max(thresholds)],
+        'server_only': server_only,
+    }
+
+
+def client_bundle(compiled, server_model: bool = False):
+    """Return ``(body_bytes, etag)`` for ``compiled``, built once per rule set"""
+    bundles = getattr(compiled, '_client_bundle', None)
+    if bundles is None:
+        bundles = compiled._client_bundle = {}
+    cached = bundles.get(server_model)
+    if cached is None:
+        body = json.dumps(build_client_bundle(compiled, server_model), separators=(',', ':'),
+                          ensure_ascii=False, sort_keys=True).encode('utf-8')
+        etag = '"' + hashlib.sha256(body).hexdigest()[:20] + '"'
+        cached = bundles[server_model] = (body, etag)
+    return cached
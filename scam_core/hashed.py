@@ -0,0 +1,165 @@
+"""Hashed n-gram linear model, an optional second stage after the rules.
+
+Word 1-2 grams and character (UTF-8 byte) 3-5 grams of the normalized text
+are hashed with CRC-32 into a fixed number of buckets. Memory is
+``4 * 2**bits`` bytes whatever the vocabulary, and there is no vocabulary to
+ship. The weights are trained offline with NumPy
+(``tools/train_hashed_model.py``); inference is a sparse dot product over
+the message's few hundred features in pure Python, with a vectorized NumPy
+path for batches when NumPy is installed.
+
+Model file: a header (magic, format, JSON length), the JSON settings
+(bits, n-gram ranges, bias, version) and then the float32 weights,
+little-endian, 8-byte aligned.
+"""
+import json
+import math
+import struct
+import sys
+import zlib
+from array import array
+
+from .normalize import normalize
+
+MAGIC = b'VSHM'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sII')  # magic, format, json bytes
+
+DEFAULT_BITS = 18
+WORD_NGRAMS = (1, 2)
+CHAR_NGRAMS = (3, 5)
+
+# Seeds keep word and character n-grams with the same spelling apart
+_WORD_SEED = zlib.crc32(b'word')
+_CHAR_SEED = zlib.crc32(b'char')
+
+
+def _hashes(text: str, word_ngrams, char_ngrams) -> list:
+    crc32 = zlib.crc32
+    words = normalize(text).split()
+    hashes = [
+        crc32(' '.join(words[i:i + n]).encode('utf-8'), _WORD_SEED)
+        for n in range(word_ngrams[0], word_ngrams[1] + 1)
+        for i in range(len(words) - n + 1)
+    ]
+    # Character n-grams are taken over the UTF-8 bytes: the same as characters
+    # for ASCII, and one encode per message instead of one per n-gram
+    padded = (' ' + ' '.join(words) + ' ').encode('utf-8')
+    hashes += [
+        crc32(padded[i:i + n], _CHAR_SEED)
+        for n in range(char_ngrams[0], char_ngrams[1] + 1)
+        for i in range(len(padded) - n + 1)
+    ]
+    return hashes
+
+
+def hashed_features(text: str, bits: int = DEFAULT_BITS, word_ngrams=WORD_NGRAMS,
+                    char_ngrams=CHAR_NGRAMS):
+    """Return ``(indices, values)`` of the hashed n-gram vector.
+
+    Each n-gram occurrence contributes ``1/sqrt(n)`` for ``n`` n-grams in the
+    message, so long and short messages score on the same scale. An index
+    repeats when an n-gram does (or two share a bucket); consumers sum them.
+    """
+    mask = (1 << bits) - 1
+    hashes = _hashes(text, word_ngrams, char_ngrams)
+    if not hashes:
+        return [], []
+    value = 1.0 / math.sqrt(len(hashes))
+    return [h & mask for h in hashes], [value] * len(hashes)
+
+
+class HashedModel:
+    """Logistic regression over hashed n-gram features"""
+
+    def __init__(self, weights, bias: float = 0.0, bits: int = DEFAULT_BITS,
+                 word_ngrams=WORD_NGRAMS, char_ngrams=CHAR_NGRAMS, version: str = 'hashed-1'):
+        if len(weights) != 1 << bits:
+            raise ValueError(f"expected {1 << bits} weights, got {len(weights)}")
+        self.weights = weights if isinstance(weights, array) else array('f', weights)
+        self.bias = float(bias)
+        self.bits = bits
+        self.word_ngrams = tuple(word_ngrams)
+        self.char_ngrams = tuple(char_ngrams)
+        self.version = version
+
+    def features(self, text: str):
+        return hashed_features(text, self.bits, self.word_ngrams, self.char_ngrams)
+
+    def decision(self, text: str) -> float:
+        """Log-odds that ``text`` is a scam"""
+        hashes = _hashes(text, self.word_ngrams, self.char_ngrams)
+        if not hashes:
+            return self.bias
+        # Same as dotting with hashed_features, with the scaling applied once
+        indices = map(((1 << self.bits) - 1).__and__, hashes)
+        return self.bias + sum(map(self.weights.__getitem__, indices)) / math.sqrt(len(hashes))
+
+    def probability(self, text: str) -> float:
+        return _sigmoid(self.decision(text))
+
+    def probability_batch(self, texts) -> list:
+        """Probabilities for many texts; vectorized when NumPy is available"""
+        texts = list(texts)
+        try:
+            import numpy as np
+        except ImportError:
+            return [self.probability(text) for text in texts]
+        hashes = []
+        counts = []
+        for text in texts:
+            text_hashes = _hashes(text, self.word_ngrams, self.char_ngrams)
+            hashes.extend(text_hashes)
+            counts.append(len(text_hashes))
+        counts = np.array(counts, dtype=np.int64)
+        indices = np.array(hashes, dtype=np.int64) & ((1 << self.bits) - 1)
+        weights = np.frombuffer(self.weights, dtype=np.float32)
+        sums = np.bincount(np.repeat(np.arange(len(texts)), counts), weights=weights[indices],
+                           minlength=len(texts))
+        margins = sums / np.sqrt(np.maximum(counts, 1)) + self.bias
+        return (1.0 / (1.0 + np.exp(-np.clip(margins, -500, 500)))).tolist()
+
+    def settings(self) -> dict:
+        return {
+            'version': self.version,
+            'bits': self.bits,
+            'word_ngrams': list(self.word_ngrams),
+            'char_ngrams': list(self.char_ngrams),
+            'bias': self.bias,
+        }
+
+    def save(self, path: str):
+        meta = json.dumps(self.settings()).encode('utf-8')
+        weights = array('f', self.weights)
+        if sys.byteorder == 'big':
+            weights.byteswap()
+        offset = HEADER.size + len(meta)
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(meta)))
+            f.write(meta)
+            f.write(b'\0' * (-offset % 8))
+            f.write(weights.tobytes())
+
+    @classmethod
+    def load(cls, path: str) -> 'HashedModel':
+        with open(path, 'rb') as f:
+            data = f.read()
+        magic, version, meta_len = HEADER.unpack_from(data)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a hashed model file (format {FORMAT_VERSION})")
+        meta = json.loads(data[HEADER.size:HEADER.size + meta_len])
+        offset = HEADER.size + meta_len
+        offset += -offset % 8
+        weights = array('f')
+        weights.frombytes(data[offset:])
+        if sys.byteorder == 'big':
+            weights.byteswap()
+        return cls(weights, meta['bias'], meta['bits'], meta['word_ngrams'],
+                   meta['char_ngrams'], meta['version'])
+
+
+def _sigmoid(margin: float) -> float:
+    if margin >= 0:
+        return 1.0 / (1.0 + math.exp(-margin))
+    z = math.exp(margin)
+    return z / (1.0 + z)
@@ -0,0 +1,121 @@
+"""Language detection and folding for the language-tagged keyword packs.
+
+Detection is cheap but not free: Devanagari is recognized by script (one
+regex search, skipped for ASCII text), romanized Hindi ("Hinglish") by one
+regex pass for common Hindi words that stops as soon as enough are seen.
+Short words that are also English or European words ("ho", "se", "par")
+only count next to a marker that is unambiguously Hindi. Only the packs whose
+language is detected get scanned.
+
+A pack's keywords are matched through a ``PrefixIndex``: one regex pass
+over the prefixes of its keywords, built with ``trie_pattern``, so adding
+keywords to a pack barely changes its per-message cost.
+"""
+import re
+
+DEVANAGARI = 'devanagari'
+LATIN = 'latin'
+
+_DEVANAGARI_CHAR = re.compile('[\u0900-\u097f]')
+
+# Nukta dropped and chandrabindu folded onto anusvara, so spelling variants
+# of loanwords ("फ़्री"/"फ्री", "पाँच"/"पांच") match the same keyword
+_DEVANAGARI_FOLD = {
+    0x093C: None,  # nukta
+    0x0901: 'ं',  # chandrabindu -> anusvara
+    0x0929: 'न',  # nnna -> na
+    0x0931: 'र',  # rra -> ra
+    0x0934: 'ळ',  # llla -> lla
+}
+
+# Very common romanized Hindi words that are not words in English or the
+# main European languages
+HINGLISH_STRONG_MARKERS = frozenset((
+    'hain', 'aap', 'apna', 'apne', 'apka', 'aapka', 'aapke', 'karo', 'karein', 'nahi',
+    'nahin', 'kya', 'yeh', 'abhi', 'jaldi', 'turant', 'paise', 'paisa', 'bhejo', 'bhejein',
+    'hoga', 'liye', 'aur',
+))
+# Common Hindi words that also turn up in other languages ("ho", "se", "mein",
+# "hai"), names or abbreviations; they only count alongside a strong marker
+HINGLISH_WEAK_MARKERS = frozenset((
+    'hai', 'ho', 'ko', 'ka', 'ki', 'ke', 'se', 'mein', 'mai', 'kar', 'kare', 'ye', 'woh',
+    'gaya', 'diya', 'par', 'pe', 'bhai', 'ji',
+))
+HINGLISH_MARKERS = HINGLISH_STRONG_MARKERS | HINGLISH_WEAK_MARKERS
+HINGLISH_MIN_MARKERS = 2
+
+
+def trie_pattern(words) -> str:
+    """Regex matching any of ``words``"""
+    # As a prefix tree, so each position tries one branch per distinct next
+    # letter instead of one per word
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def pattern(node):
+        branches = [re.escape(char) + pattern(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = '(?:' + '|'.join(branches) + ')'
+        return body + '?' if '' in node else body
+
+    return pattern(trie)
+
+
+# Marker words, not parts of longer words
+_MARKER = re.compile('(?<![a-z])' + trie_pattern(HINGLISH_MARKERS) + '(?![a-z])')
+
+# Common spelling variation in romanized Hindi, folded on both sides
+_HINGLISH_FOLDS = {
+    'aa': 'a', 'ee': 'i', 'ii': 'i', 'oo': 'u', 'uu': 'u',
+    'ph': 'f', 'sh': 's', 'kh': 'k', 'gh': 'g', 'ch': 'c', 'jh': 'j',
+    'th': 't', 'dh': 'd', 'bh': 'b', 'w': 'v', 'q': 'k', 'z': 'j',
+}
+_HINGLISH_FOLD = re.compile('|'.join(sorted(_HINGLISH_FOLDS, key=len, reverse=True)))
+
+
+def fold_devanagari(text: str) -> str:
+    return text.translate(_DEVANAGARI_FOLD)
+
+
+def fold_hinglish(text: str) -> str:
+    return _HINGLISH_FOLD.sub(lambda match: _HINGLISH_FOLDS[match.group(0)], text)
+
+
+FOLDS = {DEVANAGARI: fold_devanagari, LATIN: fold_hinglish}
+
+
+def has_devanagari(normalized: str) -> bool:
+    return not normalized.isascii() and _DEVANAGARI_CHAR.search(normalized) is not None
+
+
+def is_hinglish(markers: set) -> bool:
+    """True when the marker words seen are enough to call the text Hinglish"""
+    return len(markers) >= HINGLISH_MIN_MARKERS and not HINGLISH_STRONG_MARKERS.isdisjoint(markers)
+
+
+def hinglish_markers(normalized: str, found: set = None) -> set:
+    """Add the marker words in ``normalized`` to ``found``, stopping once it is Hinglish"""
+    if found is None:
+        found = set()
+    if is_hinglish(found):
+        return found
+    for match in _MARKER.finditer(normalized):
+        found.add(match.group())
+        if is_hinglish(found):
+            break
+    return found
+
+
+def detect_scripts(normalized: str) -> tuple:
+    """Scripts of the language packs worth running on ``normalized`` text"""
+    scripts = []
+    if has_devanagari(normalized):
+        scripts.append(DEVANAGARI)
+    if is_hinglish(hinglish_markers(normalized)):
+        scripts.append(LATIN)
+    return tuple(scripts)
@@ -0,0 +1,81 @@
+"""Text normalization against common obfuscation.
+
+``normalize`` puts non-ASCII text in NFC form, lowercases it and then, in one ``str.translate`` pass
+over a precomputed table, drops zero-width and other invisible characters,
+folds Cyrillic/Greek/fullwidth homoglyphs to Latin and undoes leetspeak
+digits and symbols, and turns every kind of whitespace into a plain space.
+A bounded regex step then rejoins spaced-out letters ("u r g e n t") and
+collapses runs of spaces.
+
+The result feeds the keyword, urgency and legitimate-pattern matchers.
+Suspicious patterns and text characteristics still see the original text,
+since digits, symbols and case are what they look for.
+"""
+import re
+import unicodedata
+
+# Invisible characters used to split words without changing how they render
+_INVISIBLE = (
+    '\u00ad'  # soft hyphen
+    '\u180e'  # mongolian vowel separator
+    '\u200b\u200c\u200d\u200e\u200f'  # zero-width space/non-joiner/joiner, LRM/RLM
+    '\u2060\u2061\u2062\u2063\u2064'  # word joiner, invisible operators
+    '\ufeff'  # zero-width no-break space / BOM
+)
+
+# Lowercase look-alikes only: the table is applied after str.lower()
+_HOMOGLYPHS = {
+    # Cyrillic
+    'а': 'a', 'в': 'b', 'е': 'e', 'ё': 'e', 'к': 'k', 'м': 'm', 'н': 'h',
+    'о': 'o', 'р': 'p', 'с': 'c', 'т': 't', 'у': 'y', 'х': 'x', 'ѕ': 's',
+    'і': 'i', 'ї': 'i', 'ј': 'j', 'ԁ': 'd', 'ԛ': 'q', 'ԝ': 'w', 'һ': 'h',
+    'ɡ': 'g', 'ո': 'n',
+    # Greek
+    'α': 'a', 'β': 'b', 'ε': 'e', 'ι': 'i', 'κ': 'k', 'ν': 'v', 'ο': 'o',
+    'ρ': 'p', 'τ': 't', 'υ': 'u', 'χ': 'x', 'ω': 'w',
+}
+
+_LEET = {
+    '0': 'o', '1': 'i', '3': 'e', '4': 'a', '5': 's', '7': 't',
+    '@': 'a', '$': 's', '|': 'l',
+}
+
+
+def _build_table() -> dict:
+    table = {ord(c): None for c in _INVISIBLE}
+    table.update({ord(k): v for k, v in _HOMOGLYPHS.items()})
+    table.update({ord(k): v for k, v in _LEET.items()})
+    # Fullwidth ASCII (U+FF01-U+FF5E) folds onto its ASCII counterpart
+    for code in range(0xFF01, 0xFF5F):
+        folded = chr(code - 0xFEE0)
+        table[code] = _LEET.get(folded, folded.lower())
+    # Every other whitespace character becomes a plain space, so the collapse
+    # step only has to look for runs of spaces
+    for code in (0x09, 0x0A, 0x0B, 0x0C, 0x0D, 0x85, 0xA0, 0x1680, 0x2028, 0x2029,
+                 0x202F, 0x205F, 0x3000, *range(0x2000, 0x200B)):
+        table[code] = ' '
+    return table
+
+
+_TABLE = _build_table()
+
+# Four or more single letters separated by one space/dot/dash/underscore/star;
+# the upper bound keeps the match linear on adversarial input
+_SPACED_LETTERS = re.compile(r'(?<![a-z])(?:[a-z][ .\-_*]){3,63}[a-z](?![a-z])')
+_SEPARATORS = re.compile(r'[ .\-_*]')
+_SPACE_RUNS = re.compile(r' {2,}')
+
+
+def _join_letters(match) -> str:
+    return _SEPARATORS.sub('', match.group(0))
+
+
+def normalize(text: str) -> str:
+    """Lowercased, de-obfuscated form of ``text`` used by the word matchers"""
+    if not text.isascii():
+        # Composed form, so Devanagari vowel signs and accents compare equal
+        text = unicodedata.normalize('NFC', text)
+    folded = _SPACED_LETTERS.sub(_join_letters, text.lower().translate(_TABLE))
+    if '  ' in folded:
+        folded = _SPACE_RUNS.sub(' ', folded)
+    return folded
@@ -0,0 +1,148 @@
+"""Startup warm-up and readiness reporting for the web entry points.
+
+``Readiness.start`` runs a small built-in corpus through every scoring path
+the app exposes on a background thread, so rules are compiled, regexes and
+language folds are cached and the interpreter has run each code path once
+before the load balancer sends traffic. Until it finishes the readiness
+endpoint answers 503.
+
+Request handlers time their scoring calls with ``Readiness.track``; the
+readiness report carries rolling p50/p99 over the recent samples and the
+number of requests being scored, and turns unready when p99 goes over an
+optional limit so slow instances drop out of rotation.
+"""
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Covers every rule stage: keywords, urgency, patterns, spaced and leetspeak
+# obfuscation, homoglyphs, Hinglish and Devanagari packs, and safe text
+WARMUP_MESSAGES = (
+    "URGENT!!! You are a WINNER of $1,000,000. Click link http://example.com to claim now!!!",
+    "Your account is suspended. Verify account at https://paypal.com.example/login asap reply",
+    "SSN 123-45-6789 card 1234 5678 9012 3456, wire transfer money via western union",
+    "U R G E N T: you are the w1nner of our l0ttery, cl1ck l1nk to claim",
+    "Ur\u200bgent \u0430ccount verific\u0430tion needed. Act   now!!!",
+    "aap ka account band ho jayega, turant KYC update karo aur OTP bhejo",
+    "आपका खाता बंद हो जाएगा, तुरंत ओटीपी भेजें",
+    "Hi, thank you for the notes from this morning's meeting. Best regards, Priya",
+    "Good morning! How are you? Lunch at 1pm works for me.",
+)
+
+
+class Readiness:
+    """Warm-up state plus a rolling window of scoring latencies"""
+
+    def __init__(self, version=None, window: int = 1024, max_age: float = 60.0,
+                 max_p99_ms: float = None, min_samples: int = 20):
+        self._version = version  # Callable returning the live rule-pack version
+        self._samples = deque(maxlen=window)  # (finished at, seconds)
+        self.max_age = max_age
+        self.max_p99_ms = max_p99_ms
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.warmed_up = False
+        self.warm_up_ms = None
+        self.warm_up_error = None
+
+    def start(self, paths, messages=WARMUP_MESSAGES, rounds: int = 2) -> threading.Thread:
+        """Run ``messages`` through each callable in ``paths`` on a background thread"""
+        thread = threading.Thread(
+            target=self.warm_up, args=(paths, messages, rounds), name='warm-up', daemon=True
+        )
+        thread.start()
+        return thread
+
+    def warm_up(self, paths, messages=WARMUP_MESSAGES, rounds: int = 2):
+        start = time.perf_counter()
+        try:
+            for _ in range(rounds):
+                for path in paths:
+                    for message in messages:
+                        path(message)
+        except Exception as e:
+            # Still serve: a broken path shows up in the report, not as a dead worker
+            self.warm_up_error = repr(e)
+        self.warm_up_ms = round((time.perf_counter() - start) * 1000, 1)
+        self.warmed_up = True
+
+    @contextmanager
+    def track(self):
+        """Time the scoring work done inside the ``with`` block"""
+        with self._lock:
+            self.in_flight += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            with self._lock:
+                self.in_flight -= 1
+                self._samples.append((now, now - start))
+
+    def latency(self) -> dict:
+        """p50/p99 in milliseconds over samples younger than ``max_age``"""
+        oldest = time.perf_counter() - self.max_age
+        with self._lock:
+            durations = sorted(seconds for finished, seconds in self._samples if finished >= oldest)
+        n = len(durations)
+
+        def percentile(p: float):
+            if not n:
+                return None
+            return round(durations[max(math.ceil(p * n) - 1, 0)] * 1000, 3)
+
+        return {'samples': n, 'p50_ms': percentile(0.50), 'p99_ms': percentile(0.99)}
+
+    def report(self, **queues) -> tuple:
+        """Return ``(body, ready)``; ``queues`` are extra queue depths to include"""
+        latency = self.latency()
+        ready = self.warmed_up
+        reasons = [] if ready else ['warming up']
+        if (self.max_p99_ms is not None and latency['samples'] >= self.min_samples
+                and latency['p99_ms'] > self.max_p99_ms):
+            ready = False
+            reasons.append(f"p99 {latency['p99_ms']} ms over {self.max_p99_ms} ms")
+        body = {
+            'ready': ready,
+            'reasons': reasons,
+            'rule_pack_version': self._version() if self._version is not None else None,
+            'latency': latency,
+            'queue_depth': dict(queues, in_flight=self.in_flight),
+            'warm_up': {
+                'done': self.warmed_up,
+                'ms': self.warm_up_ms,
+                'error': self.warm_up_error,
+            },
+        }
+        return body, ready
+
+
+def scoring_paths(detector) -> list:
+    """Warm-up callables for every way the scam_core apps score a message"""
+    from .conversation import ConversationStore
+    from .export import client_bundle
+    from .mail import analyze_email, parse_email
+
+    store = ConversationStore(detector, max_conversations=16)
+
+    def email(text):
+        raw = (
+            "Subject: warm-up\r\nContent-Type: text/html; charset=utf-8\r\n\r\n"
+            f"<p>{text}</p><a href=\"http://example.net\">example.com</a>"
+        )
+        return analyze_email(detector, parse_email(raw.encode('utf-8')))
+
+    return [
+        detector.analyze_text,
+        # The budgeted path, without counting toward budget_stats
+        lambda text: detector.rules.scan(text, time.perf_counter() + 1.0),
+        lambda text: detector.scan_batch([text]),
+        lambda text: store.add_message('warm-up', text),
+        email,
+        lambda text: detector.scan_chunks([text]),
+        lambda text: client_bundle(detector.rules, server_model=detector.model is not None),
+    ]
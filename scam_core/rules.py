@@ -0,0 +1,191 @@
+"""Default rule tables for the scam detection core.
+
+Plain data only: nothing in this module is compiled at import time, so
+importing it costs next to nothing. ``scam_core.detector`` turns these
+tables into compiled state the first time a message is scored.
+"""
+
+# Common scam keywords and patterns
+SCAM_KEYWORDS = {
+    'urgent': 3.0,
+    'immediate': 2.5,
+    'act now': 3.5,
+    'limited time': 2.8,
+    'winner': 3.2,
+    'congratulations': 2.7,
+    'lottery': 3.5,
+    'inheritance': 3.0,
+    'prince': 2.8,
+    'million': 2.5,
+    'urgent response': 3.5,
+    'verify account': 3.0,
+    'suspended': 2.8,
+    'click link': 3.2,
+    'wire transfer': 3.0,
+    'gift card': 2.8,
+    'bitcoin': 2.5,
+    'cryptocurrency': 2.3,
+    'urgent wire': 3.8,
+    'confidential': 2.5,
+    'secret': 2.3,
+    'do not tell': 3.0,
+    'western union': 3.5,
+    'moneygram': 3.5,
+    'paypal': 2.0,
+    'account verification': 3.2,
+    'security alert': 3.0,
+    'suspended account': 3.3,
+    'unauthorized access': 2.8,
+    'confirm identity': 3.0,
+    'validate account': 3.0
+}
+
+# Language-tagged keyword packs, only scanned when their script/language is
+# detected in the message (see ``scam_core.language``)
+LANGUAGE_PACKS = {
+    'hi': {
+        'script': 'devanagari',
+        'scam_keywords': {
+            'तुरंत': 3.0,  # immediately
+            'जल्दी करें': 2.8,  # hurry
+            'लॉटरी': 3.5,
+            'इनाम': 3.0,  # prize
+            'विजेता': 3.2,  # winner
+            'बधाई हो': 2.7,  # congratulations
+            'करोड़': 2.5,  # crore
+            'खाता बंद': 3.3,  # account closed
+            'खाता निलंबित': 3.3,  # account suspended
+            'केवाईसी': 3.0,  # KYC
+            'ओटीपी': 3.5,  # OTP
+            'पिन नंबर': 3.0,
+            'आधार नंबर': 2.8,
+            'पैसे भेजें': 3.0,  # send money
+            'पैसे ट्रांसफर': 3.0,
+            'गिफ्ट कार्ड': 2.8,
+            'लिंक पर क्लिक': 3.2,
+            'किसी को मत बताना': 3.0,  # do not tell anyone
+            'गोपनीय': 2.5,  # confidential
+            'सत्यापित करें': 3.0,  # verify
+        },
+    },
+    'hi-Latn': {
+        'script': 'latin',
+        'scam_keywords': {
+            'turant': 3.0,
+            'jaldi karo': 2.8,
+            'inaam': 3.0,
+            'badhai ho': 2.7,
+            'crore': 2.5,
+            'khata band': 3.3,
+            'account band': 3.3,
+            'kyc update': 3.0,
+            'otp share': 3.5,
+            'otp bataye': 3.5,
+            'otp batao': 3.5,
+            'pin batao': 3.0,
+            'aadhaar number': 2.8,
+            'paise bhejo': 3.0,
+            'paise bhejein': 3.0,
+            'link pe click': 3.2,
+            'link par click': 3.2,
+            'kisi ko mat batana': 3.0,
+            'verify karein': 3.0,
+            'verify karo': 3.0,
+        },
+    },
+}
+
+# Suspicious patterns
+SUSPICIOUS_PATTERNS = [
+    r'\b\d{3}-\d{2}-\d{4}\b',  # SSN pattern
+    r'\b\d{4}[\s-]?\d{4}[\s-]?\d{4}[\s-]?\d{4}\b',  # Credit card
+    r'\b[A-Z]{2,}\b',  # ALL CAPS words
+    r'[!]{2,}',  # Multiple exclamation marks
+    r'\$\d+(?:,\d{3})*(?:\.\d{2})?',  # Dollar amounts
+    r'\b\d+\s*(?:million|billion|thousand)\b',  # Large amounts
+    r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+',  # URLs
+    r'\b(?:urgent|immediate|asap)\b.*?\b(?:respond|reply|click)\b',  # Urgent action
+    r'\b(?:click|visit).*\b(?:link|url)\b',  # Click requests
+    r'\b(?:wire|send|transfer).*\b(?:money|funds)\b',  # Money requests
+]
+PATTERN_WEIGHT = 2.0  # Added per match of a suspicious pattern
+
+# Legitimate patterns (reduce scam score)
+LEGITIMATE_PATTERNS = [
+    r'\bthank you\b',
+    r'\bregards\b',
+    r'\bbest regards\b',
+    r'\bsincerely\b',
+    r'\bhello\b',
+    r'\bhi\b',
+    r'\bhow are you\b',
+    r'\bgood morning\b',
+    r'\bgood afternoon\b',
+    r'\bgood evening\b',
+]
+LEGITIMATE_WEIGHT = -0.5  # Added per match of a legitimate pattern
+
+# Urgency indicators
+URGENCY_WORDS = ['urgent', 'immediate', 'asap', 'hurry', 'quick']
+URGENCY_WEIGHT = 1.5
+
+# Text characteristics
+EXCLAMATION_THRESHOLD = 3  # More than this many '!' adds to the score
+EXCLAMATION_WEIGHT = 0.5
+CAPS_RATIO_THRESHOLD = 0.3
+CAPS_RATIO_WEIGHT = 5.0
+
+# Email links whose visible text names a different host than their href.
+# Not a tunable feature: tools/tune_weights.py learns from text corpora
+LINK_MISMATCH_WEIGHT = 10.0  # Added per mismatched link
+
+# Score normalization and risk bands, highest band first
+MAX_POSSIBLE_SCORE = 50.0
+SCAM_THRESHOLD = 40
+RISK_BANDS = [
+    (70, "HIGH RISK", "red"),
+    (40, "MEDIUM RISK", "orange"),
+    (20, "LOW RISK", "yellow"),
+    (0, "SAFE", "green"),
+]
+
+DEFAULT_RULE_PACK_VERSION = 'default-1'
+
+
+def default_rule_pack() -> dict:
+    """Return the default rules as a JSON-serializable rule pack.
+
+    A rule pack carries a weight for every individual rule, so tuned packs
+    can reweight single patterns without touching this module.
+    """
+    return {
+        'version': DEFAULT_RULE_PACK_VERSION,
+        'scam_keywords': dict(SCAM_KEYWORDS),
+        'language_packs': {
+            tag: {'script': lang['script'], 'scam_keywords': dict(lang['scam_keywords'])}
+            for tag, lang in LANGUAGE_PACKS.items()
+        },
+        'suspicious_patterns': [[p, PATTERN_WEIGHT] for p in SUSPICIOUS_PATTERNS],
+        'legitimate_patterns': [[p, LEGITIMATE_WEIGHT] for p in LEGITIMATE_PATTERNS],
+        'urgency_words': list(URGENCY_WORDS),
+        'urgency_weight': URGENCY_WEIGHT,
+        'exclamation_threshold': EXCLAMATION_THRESHOLD,
+        'exclamation_weight': EXCLAMATION_WEIGHT,
+        'caps_ratio_threshold': CAPS_RATIO_THRESHOLD,
+        'caps_ratio_weight': CAPS_RATIO_WEIGHT,
+        'link_mismatch_weight': LINK_MISMATCH_WEIGHT,
+        'max_possible_score': MAX_POSSIBLE_SCORE,
+        'scam_threshold': SCAM_THRESHOLD,
+        'risk_bands': [list(band) for band in RISK_BANDS],
+    }
+
+
+def load_rule_pack(path: str) -> dict:
+    """Load a rule pack from a JSON file, filling missing keys from the defaults"""
+    import json
+
+    with open(path, 'r', encoding='utf-8') as f:
+        pack = json.load(f)
+    merged = default_rule_pack()
+    merged.update(pack)
+    return merged
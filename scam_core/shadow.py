@@ -0,0 +1,261 @@
+"""Shadow evaluation of a candidate rule pack against live traffic.
+
+A sample of the texts scored by the primary detector is handed, together
+with the live verdict and its per-stage timings, to a child process that
+scores them with the candidate configuration only. The child is a separate
+interpreter (``python -m scam_core.shadow``), so its work never holds the
+request process's GIL; a request only pays for timing its own stages and a
+put on a bounded queue, and texts over ``max_length`` are not sampled.
+Verdicts cut short by a latency budget are not compared either: the child
+always runs a full scan, so they would show up as spurious level changes.
+
+In the request process a feeder thread writes jobs to the child's stdin
+and a reader thread folds its answers, verdict changes and per-stage
+timing deltas, into bounded buffers for the summary endpoint. Submitting
+never blocks: when the queue is full the sample is dropped and counted.
+
+Timings come from two processes: the primary's are measured on the request
+path under live load, the candidate's in the otherwise idle child.
+"""
+import json
+import os
+import queue
+import random
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+
+from .detector import MODEL_STAGE, STAGES, ScamDetector
+
+# Timing keys reported per scan: normalization, each rule stage, then the model
+TIMING_KEYS = ('normalize',) + STAGES + (MODEL_STAGE,)
+
+DEFAULT_MAX_LENGTH = 20000
+
+_STOP = object()
+_PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _verdict(result, timings: dict) -> dict:
+    return {
+        'score': result.score,
+        'risk_level': result.risk()[0],
+        'is_scam': result.is_scam,
+        'fired': sorted({result.rules.feature_name(rule_id) for rule_id in result.rule_ids}),
+        'timings': timings,
+    }
+
+
+class ShadowEvaluator:
+    """Compare live verdicts with a candidate ``ScamDetector`` configuration.
+
+    ``candidate`` holds the ``ScamDetector`` keyword arguments for the
+    candidate (``rule_pack``, and ``model``/``model_blend`` with a model
+    path), which must be JSON-serializable.
+    """
+
+    def __init__(self, primary: ScamDetector, candidate: dict, sample_rate: float = 0.05,
+                 maxsize: int = 1000, buffer_size: int = 10000, max_diffs: int = 200,
+                 max_length: int = DEFAULT_MAX_LENGTH):
+        self.primary = primary
+        self.sample_rate = sample_rate
+        self.max_length = max_length
+        self.candidate_version = None
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._lock = threading.Lock()
+        # (score delta, primary timings, candidate timings) for recent samples
+        self._samples = deque(maxlen=buffer_size)
+        # Recent samples whose risk level or verdict changed
+        self._diffs = deque(maxlen=max_diffs)
+        self.counts = {'submitted': 0, 'sampled_out': 0, 'too_long': 0, 'partial': 0,
+                       'dropped': 0, 'compared': 0, 'errors': 0, 'level_changes': 0,
+                       'became_scam': 0, 'stopped_being_scam': 0}
+        self.transitions = {}  # "PRIMARY LEVEL -> CANDIDATE LEVEL" -> count
+
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, (_PACKAGE_ROOT, env.get('PYTHONPATH'))))
+        self._child = subprocess.Popen(
+            [sys.executable, '-m', 'scam_core.shadow'], env=env,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE
+        )
+        self._send_line(candidate)
+        self._feeder = threading.Thread(target=self._feed, name='shadow-feed', daemon=True)
+        self._reader = threading.Thread(target=self._read, name='shadow-read', daemon=True)
+        self._feeder.start()
+        self._reader.start()
+
+    def _count(self, key: str):
+        with self._lock:
+            self.counts[key] += 1
+
+    @property
+    def alive(self) -> bool:
+        return self._child.poll() is None
+
+    def sample(self, text: str) -> bool:
+        """Decide whether ``text`` goes to the shadow; if so, score it with timings and ``submit``"""
+        if not text or not text.strip() or (self.sample_rate < 1.0 and random.random() >= self.sample_rate):
+            self._count('sampled_out')
+            return False
+        if len(text) > self.max_length:
+            self._count('too_long')
+            return False
+        return self.alive
+
+    def submit(self, text: str, result, timings: dict):
+        """Queue ``text`` and its live ``ScanResult`` for comparison; never blocks"""
+        if result.partial:
+            self._count('partial')
+            return
+        job = {'text': text, 'primary': _verdict(result, timings)}
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            self._count('dropped')
+        else:
+            self._count('submitted')
+
+    def _send_line(self, item):
+        self._child.stdin.write(json.dumps(item, ensure_ascii=False).encode('utf-8') + b'\n')
+        self._child.stdin.flush()
+
+    def _feed(self):
+        while True:
+            job = self._queue.get()
+            if job is _STOP:
+                break
+            try:
+                self._send_line(job)
+            except (OSError, ValueError):
+                self._count('errors')
+                break
+        try:
+            self._child.stdin.close()
+        except OSError:
+            pass
+
+    def _read(self):
+        for line in self._child.stdout:
+            try:
+                answer = json.loads(line)
+            except ValueError:
+                self._count('errors')
+                continue
+            if 'version' in answer:
+                self.candidate_version = answer['version']
+            elif 'error' in answer:
+                self._count('errors')
+            else:
+                self._record(answer['primary'], answer['candidate'], answer['length'])
+
+    def _record(self, primary: dict, candidate: dict, length: int):
+        primary_level = primary['risk_level']
+        candidate_level = candidate['risk_level']
+        sample = (
+            candidate['score'] - primary['score'],
+            tuple(primary['timings'].get(key, 0.0) for key in TIMING_KEYS),
+            tuple(candidate['timings'].get(key, 0.0) for key in TIMING_KEYS),
+        )
+        diff = None
+        if primary_level != candidate_level or primary['is_scam'] != candidate['is_scam']:
+            primary_fired = set(primary['fired'])
+            candidate_fired = set(candidate['fired'])
+            diff = {
+                'ts': time.time(),
+                'length': length,
+                'primary': {'score': round(primary['score'], 1), 'risk_level': primary_level,
+                            'is_scam': primary['is_scam']},
+                'candidate': {'score': round(candidate['score'], 1), 'risk_level': candidate_level,
+                              'is_scam': candidate['is_scam']},
+                'rules_added': sorted(candidate_fired - primary_fired),
+                'rules_removed': sorted(primary_fired - candidate_fired),
+            }
+        with self._lock:
+            self.counts['compared'] += 1
+            self._samples.append(sample)
+            if diff is not None:
+                self._diffs.append(diff)
+                if primary_level != candidate_level:
+                    self.counts['level_changes'] += 1
+                    key = f"{primary_level} -> {candidate_level}"
+                    self.transitions[key] = self.transitions.get(key, 0) + 1
+                if candidate['is_scam'] and not primary['is_scam']:
+                    self.counts['became_scam'] += 1
+                elif primary['is_scam'] and not candidate['is_scam']:
+                    self.counts['stopped_being_scam'] += 1
+
+    @property
+    def queued(self) -> int:
+        return self._queue.qsize()
+
+    def summary(self, recent: int = 20) -> dict:
+        """Counters since start, plus score and timing deltas over the sample buffer"""
+        with self._lock:
+            counts = dict(self.counts)
+            transitions = dict(self.transitions)
+            samples = list(self._samples)
+            diffs = list(self._diffs)[-recent:] if recent else []
+        n = len(samples)
+        stage_ms = {}
+        for i, key in enumerate(TIMING_KEYS):
+            primary_ms = sum(s[1][i] for s in samples) * 1000 / n if n else 0.0
+            candidate_ms = sum(s[2][i] for s in samples) * 1000 / n if n else 0.0
+            stage_ms[key] = {
+                'primary': round(primary_ms, 4),
+                'candidate': round(candidate_ms, 4),
+                'delta': round(candidate_ms - primary_ms, 4),
+            }
+        return dict(
+            counts,
+            primary_version=self.primary.rules.version,
+            candidate_version=self.candidate_version,
+            worker_alive=self.alive,
+            sample_rate=self.sample_rate,
+            max_length=self.max_length,
+            queued=self.queued,
+            window=n,
+            mean_score_delta=round(sum(s[0] for s in samples) / n, 3) if n else 0.0,
+            mean_abs_score_delta=round(sum(abs(s[0]) for s in samples) / n, 3) if n else 0.0,
+            transitions=transitions,
+            stage_ms=stage_ms,
+            recent_diffs=diffs,
+        )
+
+    def close(self, timeout: float = 2.0):
+        if self._feeder.is_alive():
+            try:
+                self._queue.put(_STOP, timeout=timeout)
+            except queue.Full:
+                pass
+            self._feeder.join(timeout)
+        try:
+            self._child.wait(timeout)
+        except subprocess.TimeoutExpired:
+            self._child.kill()
+        self._reader.join(timeout)
+
+
+def _serve(stdin, stdout):
+    """Child process loop: candidate settings on the first line, then one job per line"""
+    detector = ScamDetector(**json.loads(stdin.readline()))
+    stdout.write(json.dumps({'version': detector.rules.version}) + '\n')
+    stdout.flush()
+    for line in stdin:
+        try:
+            job = json.loads(line)
+            timings = {}
+            result = detector.scan(job['text'], timings=timings)
+            answer = {'primary': job['primary'], 'candidate': _verdict(result, timings),
+                      'length': len(job['text'])}
+        except Exception as e:
+            answer = {'error': repr(e)}
+        stdout.write(json.dumps(answer, ensure_ascii=False) + '\n')
+        stdout.flush()
+
+
+if __name__ == '__main__':
+    sys.stdin.reconfigure(encoding='utf-8')
+    sys.stdout.reconfigure(encoding='utf-8')
+    _serve(sys.stdin, sys.stdout)
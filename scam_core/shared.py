@@ -0,0 +1,237 @@
+"""Rule state shared between worker processes through a memory-mapped file.
+
+``publish_rule_pack`` serializes a rule pack into a single read-only segment:
+the small part of the pack (patterns, thresholds, bands) as JSON, and the
+keyword table as flat arrays plus an open-addressing hash index. Workers
+attach with ``SharedRules``; keyword lookups read straight from the mapping,
+so the pages are held once by the OS page cache instead of once per worker.
+
+Compiled regexes cannot live in shared memory, so each worker still compiles
+the (small, fixed-size) pattern list itself; only the keyword table, which is
+the part that grows, is shared.
+
+Matching probes the hash index once per byte of the message and distinct
+keyword length, in Python, so its cost follows the message size rather than
+the table size. That is a trade: with the default pack of a few dozen
+keywords it is about ten times slower than the private ``KeywordTable``'s
+substring searches (16.6 ms against 1.6 ms for a 2 KB message), and it only
+pays off for tables of many thousands of keywords (see
+``benchmarks/shared_rules_bench.py``).
+
+Updates are atomic: a new segment is written next to the old one and moved
+into place with ``os.replace``. Attached workers notice the new file on their
+next check and switch over between messages, never in the middle of one. If
+the file is removed, workers keep serving the rules they last attached.
+"""
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+
+from .detector import CompiledRules
+from .normalize import normalize
+
+MAGIC = b'VSRP'
+FORMAT_VERSION = 2
+# magic, format, json bytes, keywords, hash slots, distinct lengths, blob bytes
+HEADER = struct.Struct('<4sIIIIII')
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _section_offsets(json_len, n_keywords, n_slots, n_lengths):
+    """Byte offsets of each section after the header"""
+    offsets = {}
+    offset = HEADER.size
+    for name, size in (
+        ('json', json_len),
+        ('first_bytes', 256),
+        ('lengths', 2 * n_lengths),
+        ('weights', 8 * n_keywords),
+        ('starts', 4 * (n_keywords + 1)),
+        ('name_starts', 4 * (n_keywords + 1)),
+        ('slots', 4 * n_slots),
+        ('blob', 0),
+    ):
+        offset = _align(offset)
+        offsets[name] = offset
+        offset += size
+    return offsets
+
+
+def build_segment(pack: dict) -> bytes:
+    """Serialize ``pack`` into the shared segment format"""
+    # Stored pre-normalized, like KeywordTable's needles
+    keywords = [normalize(keyword).encode('utf-8') for keyword in pack['scam_keywords']]
+    for keyword, needle in zip(pack['scam_keywords'], keywords):
+        if not needle:
+            raise ValueError(f"keyword {keyword!r} is empty after normalization")
+    weights = list(pack['scam_keywords'].values())
+    small = {key: value for key, value in pack.items() if key != 'scam_keywords'}
+    json_bytes = json.dumps(small).encode('utf-8')
+
+    n_slots = 8
+    while n_slots < 2 * len(keywords):
+        n_slots *= 2
+    mask = n_slots - 1
+    slots = [0] * n_slots
+    for index, keyword in enumerate(keywords):
+        slot = zlib.crc32(keyword) & mask
+        while slots[slot]:
+            slot = (slot + 1) & mask
+        slots[slot] = index + 1  # 0 marks an empty slot
+
+    lengths = sorted({len(keyword) for keyword in keywords})
+    first_bytes = bytearray(256)
+    for keyword in keywords:
+        first_bytes[keyword[0]] = 1
+
+    # The blob holds the needles, then the keywords as configured, for reasons
+    names = [keyword.encode('utf-8') for keyword in pack['scam_keywords']]
+    starts = [0]
+    for keyword in keywords:
+        starts.append(starts[-1] + len(keyword))
+    name_starts = [starts[-1]]
+    for name in names:
+        name_starts.append(name_starts[-1] + len(name))
+    blob = b''.join(keywords) + b''.join(names)
+
+    offsets = _section_offsets(len(json_bytes), len(keywords), n_slots, len(lengths))
+    segment = bytearray(offsets['blob'] + len(blob))
+    HEADER.pack_into(segment, 0, MAGIC, FORMAT_VERSION, len(json_bytes),
+                     len(keywords), n_slots, len(lengths), len(blob))
+    segment[offsets['json']:offsets['json'] + len(json_bytes)] = json_bytes
+    segment[offsets['first_bytes']:offsets['first_bytes'] + 256] = first_bytes
+    struct.pack_into(f'<{len(lengths)}H', segment, offsets['lengths'], *lengths)
+    struct.pack_into(f'<{len(weights)}d', segment, offsets['weights'], *weights)
+    struct.pack_into(f'<{len(starts)}I', segment, offsets['starts'], *starts)
+    struct.pack_into(f'<{len(name_starts)}I', segment, offsets['name_starts'], *name_starts)
+    struct.pack_into(f'<{n_slots}I', segment, offsets['slots'], *slots)
+    segment[offsets['blob']:] = blob
+    return bytes(segment)
+
+
+def publish_rule_pack(pack: dict, path: str):
+    """Atomically replace the segment at ``path`` with ``pack``"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(build_segment(pack))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class SharedKeywordTable:
+    """``KeywordTable`` interface over a mapped segment, without copying it"""
+
+    def __init__(self, buffer, offsets, n_keywords, n_slots, n_lengths):
+        view = memoryview(buffer)
+        self._buffer = buffer
+        self._n = n_keywords
+        self._mask = n_slots - 1
+        self._first_bytes = bytes(view[offsets['first_bytes']:offsets['first_bytes'] + 256])
+        self._lengths = tuple(view[offsets['lengths']:offsets['lengths'] + 2 * n_lengths].cast('H'))
+        self._weights = view[offsets['weights']:offsets['weights'] + 8 * n_keywords].cast('d')
+        self._starts = view[offsets['starts']:offsets['starts'] + 4 * (n_keywords + 1)].cast('I')
+        self._name_starts = view[
+            offsets['name_starts']:offsets['name_starts'] + 4 * (n_keywords + 1)
+        ].cast('I')
+        self._slots = view[offsets['slots']:offsets['slots'] + 4 * n_slots].cast('I')
+        self._blob = offsets['blob']
+
+    def __len__(self):
+        return self._n
+
+    def __iter__(self):
+        for index in range(self._n):
+            yield self.keyword(index), self._weights[index]
+
+    def _keyword_bytes(self, index: int) -> bytes:
+        return self._buffer[self._blob + self._starts[index]:self._blob + self._starts[index + 1]]
+
+    def keyword(self, index: int) -> str:
+        start = self._blob + self._name_starts[index]
+        return self._buffer[start:self._blob + self._name_starts[index + 1]].decode('utf-8')
+
+    def weight(self, index: int) -> float:
+        return self._weights[index]
+
+    def needle(self, index: int) -> str:
+        return self._keyword_bytes(index).decode('utf-8')
+
+    def match(self, normalized: str) -> list:
+        data = normalized.encode('utf-8')
+        size = len(data)
+        first_bytes = self._first_bytes
+        slots = self._slots
+        mask = self._mask
+        crc32 = zlib.crc32
+        found = set()
+        # UTF-8 is self-synchronizing, so byte substrings equal str substrings
+        for start in range(size):
+            if not first_bytes[data[start]]:
+                continue
+            for length in self._lengths:
+                end = start + length
+                if end > size:
+                    break
+                piece = data[start:end]
+                slot = crc32(piece) & mask
+                # Keywords that normalize alike share a probe chain; all fire
+                while slots[slot]:
+                    index = slots[slot] - 1
+                    if self._keyword_bytes(index) == piece:
+                        found.add(index)
+                    slot = (slot + 1) & mask
+        return sorted(found)
+
+
+def attach_segment(path: str) -> CompiledRules:
+    """Map the segment at ``path`` read-only and compile its rules"""
+    with open(path, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, fmt, json_len, n_keywords, n_slots, n_lengths, _ = HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC or fmt != FORMAT_VERSION:
+        raise ValueError(f"{path} is not a version {FORMAT_VERSION} rule segment")
+    offsets = _section_offsets(json_len, n_keywords, n_slots, n_lengths)
+    pack = json.loads(buffer[offsets['json']:offsets['json'] + json_len])
+    table = SharedKeywordTable(buffer, offsets, n_keywords, n_slots, n_lengths)
+    return CompiledRules(pack, keyword_table=table)
+
+
+class SharedRules:
+    """A worker's handle on a published segment, following atomic updates"""
+
+    def __init__(self, path: str, check_interval: float = 1.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._identity = None
+        self._rules = None
+        self._next_check = 0.0
+        self.current()
+
+    def current(self) -> CompiledRules:
+        """Rules from the newest published segment, checked at most once per interval"""
+        now = time.monotonic()
+        if now >= self._next_check:
+            with self._lock:
+                if now >= self._next_check:
+                    try:
+                        stat = os.stat(self.path)
+                        identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+                        if identity != self._identity:
+                            # In-flight scans keep the old mapping alive until they finish
+                            self._rules = attach_segment(self.path)
+                            self._identity = identity
+                    except FileNotFoundError:
+                        # Removed: keep the last attached rules, or fail on the first attach
+                        if self._rules is None:
+                            raise
+                    self._next_check = now + self.check_interval
+        return self._rules
@@ -0,0 +1,179 @@
+// Client-side scam pre-scoring with the rule bundle served at /rules.
+//
+// Mirrors scam_core's ScamDetector exactly for plain ASCII input. Anything
+// else (Unicode text, borderline scores, rules only the server can run) is
+// escalated to /analyze.
+class LocalScorer {
+    constructor(bundle) {
+        this.bundle = bundle;
+        const table = bundle.normalize.table;
+        const foldChars = Object.keys(table)
+            .map(ch => '\\u' + ch.charCodeAt(0).toString(16).padStart(4, '0'))
+            .join('');
+        this.foldTable = table;
+        this.foldRe = new RegExp('[' + foldChars + ']', 'g');
+        this.spacedLettersRe = new RegExp(bundle.normalize.spaced_letters, 'g');
+        this.separatorsRe = new RegExp(bundle.normalize.separators, 'g');
+
+        const hinglish = bundle.hinglish;
+        this.hinglishMarkers = new Set(hinglish.markers);
+        this.hinglishStrongMarkers = new Set(hinglish.strong_markers);
+        this.hinglishFolds = hinglish.folds;
+        const foldKeys = Object.keys(hinglish.folds).sort((a, b) => b.length - a.length);
+        this.hinglishFoldRe = new RegExp(foldKeys.join('|'), 'g');
+
+        // Rule ids follow the server's order: keywords, patterns, legitimate
+        // patterns, exclamations, caps ratio, urgency, language keywords
+        this.rules = [];
+        this.keywordIds = bundle.keywords.map(([needle, weight, keyword]) =>
+            this.addRule(weight, `Contains suspicious keyword: '${keyword}'`, { needle }));
+        this.patternIds = bundle.patterns.filter(Boolean).map(([pattern, weight]) =>
+            this.addRule(weight, `Matches suspicious pattern: ${pattern}`, { regex: new RegExp(pattern, 'gi') }));
+        this.legitimateIds = bundle.legitimate.filter(Boolean).map(([pattern, weight]) =>
+            this.addRule(weight, null, { regex: new RegExp(pattern, 'g') }));
+        this.exclamationId = this.addRule(bundle.exclamation_weight, null, {});
+        this.capsRatioId = this.addRule(bundle.caps_ratio_weight, null, {});
+        this.urgencyId = this.addRule(bundle.urgency_weight, null, {});
+        this.languagePacks = bundle.language_packs.map(([tag, script, keywords]) => ({
+            tag,
+            ids: keywords.map(([needle, weight, keyword]) =>
+                this.addRule(weight, `Contains suspicious keyword: '${keyword}'`, { needle }))
+        }));
+    }
+
+    static async load(url = '/rules') {
+        try {
+            const response = await fetch(url);
+            if (!response.ok) return null;
+            return new LocalScorer(await response.json());
+        } catch (error) {
+            console.warn('Local rule bundle unavailable', error);
+            return null;
+        }
+    }
+
+    addRule(weight, reason, extra) {
+        this.rules.push({ weight, reason, ...extra });
+        return this.rules.length - 1;
+    }
+
+    // Only printable ASCII plus tab/newline/VT/FF scores identically here
+    canScore(text) {
+        return /^[\x20-\x7e\t\n\x0b\x0c]*$/.test(text);
+    }
+
+    normalize(text) {
+        let folded = text.toLowerCase().replace(this.foldRe, ch => this.foldTable[ch]);
+        folded = folded.replace(this.spacedLettersRe, match => match.replace(this.separatorsRe, ''));
+        if (folded.includes('  ')) {
+            folded = folded.replace(/ {2,}/g, ' ');
+        }
+        return folded;
+    }
+
+    // Enough marker words, at least one of them unambiguously Hindi
+    isHinglish(normalized) {
+        const words = new Set(normalized.match(/[a-z]+/g) || []);
+        let markers = 0;
+        let strong = false;
+        for (const word of words) {
+            if (this.hinglishMarkers.has(word)) markers++;
+            if (this.hinglishStrongMarkers.has(word)) strong = true;
+        }
+        return strong && markers >= this.bundle.hinglish.min_markers;
+    }
+
+    score(text) {
+        const b = this.bundle;
+        if (!text.trim()) {
+            return { score: 0, risk_level: 'NO TEXT', color: 'gray', reasons: ['No text provided'], is_scam: false, local: true };
+        }
+        const normalized = this.normalize(text);
+        const fired = [];
+        const countMatches = (regex, input) => (input.match(regex) || []).length;
+
+        for (const id of this.keywordIds) {
+            if (normalized.includes(this.rules[id].needle)) fired.push([id, 1]);
+        }
+        for (const id of this.patternIds) {
+            const count = countMatches(this.rules[id].regex, text);
+            if (count) fired.push([id, count]);
+        }
+        for (const id of this.legitimateIds) {
+            const count = countMatches(this.rules[id].regex, normalized);
+            if (count) fired.push([id, count]);
+        }
+        const exclamations = text.split('!').length - 1;
+        if (exclamations > b.exclamation_threshold) fired.push([this.exclamationId, exclamations]);
+        const capsRatio = countMatches(/[A-Z]/g, text) / Math.max(text.length, 1);
+        if (capsRatio > b.caps_ratio_threshold) fired.push([this.capsRatioId, capsRatio]);
+        const urgency = b.urgency_words.filter(word => normalized.includes(word)).length;
+        if (urgency > 0) fired.push([this.urgencyId, urgency]);
+        if (this.languagePacks.length && this.isHinglish(normalized)) {
+            const folded = normalized.replace(this.hinglishFoldRe, match => this.hinglishFolds[match]);
+            for (const pack of this.languagePacks) {
+                for (const id of pack.ids) {
+                    if (folded.includes(this.rules[id].needle)) fired.push([id, 1]);
+                }
+            }
+        }
+
+        // Same summation order as the server, so floating point agrees
+        let raw = 0;
+        for (const [id, value] of fired) raw += value * this.rules[id].weight;
+        const score = Math.min((raw / b.max_possible_score) * 100, 100);
+        let band = b.risk_bands[b.risk_bands.length - 1];
+        for (const candidate of b.risk_bands) {
+            if (score >= candidate[0]) { band = candidate; break; }
+        }
+        return {
+            score: pyRound1(score),
+            risk_level: band[1],
+            color: band[2],
+            reasons: this.reasons(fired),
+            is_scam: score >= b.scam_threshold,
+            local: true
+        };
+    }
+
+    reasons(fired, limit = 5) {
+        const ranked = fired
+            .map(([id, value], position) => [-this.rules[id].weight * value, position, id, value])
+            .sort((a, b) => a[0] - b[0] || a[1] - b[1]);
+        const reasons = [];
+        for (const [contribution, , id, value] of ranked) {
+            if (reasons.length === limit || contribution >= 0) break;
+            if (id === this.exclamationId) reasons.push(`Excessive exclamation marks (${value})`);
+            else if (id === this.capsRatioId) reasons.push(`High percentage of capital letters (${pyFixed1(value * 100)}%)`);
+            else if (id === this.urgencyId) reasons.push(`Contains ${value} urgency indicators`);
+            else reasons.push(this.rules[id].reason);
+        }
+        return reasons;
+    }
+
+    // True when the local verdict should be confirmed by /analyze
+    needsServer(text, result) {
+        if (!this.canScore(text)) return true;
+        const [low, high] = this.bundle.escalate;
+        if (this.bundle.server_only.length && result.score < high) return true;
+        return result.score >= low && result.score < high;
+    }
+}
+
+// Python rounds exact binary ties (x.x25, x.x75 -> .x5) half to even;
+// toFixed rounds them up. Every other value rounds the same way.
+function pyFixed1(x) {
+    if (Number.isInteger(x * 4) && !Number.isInteger(x * 2)) {
+        const floor = Math.floor(x * 10);
+        return ((floor % 2 === 0 ? floor : floor + 1) / 10).toFixed(1);
+    }
+    return x.toFixed(1);
+}
+
+function pyRound1(x) {
+    return Number(pyFixed1(x));
+}
+
+if (typeof module !== 'undefined') {
+    module.exports = { LocalScorer, pyRound1 };
+}
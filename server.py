@@ -1,6 +1,8 @@
 from flask import Flask, request, jsonify, render_template_string, send_from_directory
 import os
 
+from scam_core.readiness import Readiness
+
 app = Flask(__name__)
 
 class ScamDetector:
@@ -62,6 +64,12 @@ class ScamDetector:
             }
 
 detector = ScamDetector()
+# The built-in word list has no rule-pack version of its own
+readiness = Readiness(
+    version=lambda: 'builtin',
+    max_p99_ms=float(os.environ['SCAM_READY_MAX_P99_MS']) if os.environ.get('SCAM_READY_MAX_P99_MS') else None
+)
+readiness.start([detector.analyze])
 
 @app.route('/')
 def index():
@@ -84,7 +92,8 @@ def analyze():
     try:
         data = request.get_json()
         message = data.get('message', '')
-        result = detector.analyze(message)
+        with readiness.track():
+            result = detector.analyze(message)
         return jsonify(result)
     except Exception as e:
         return jsonify({
@@ -96,7 +105,18 @@ def analyze():
 
 @app.route('/health')
 def health():
-    return jsonify({'status': 'healthy', 'message': 'Vishwas - Voice-enabled scam detector is running'})
+    return jsonify({
+        'status': 'healthy',
+        'message': 'Vishwas - Voice-enabled scam detector is running',
+        'warmed_up': readiness.warmed_up,
+        'latency': readiness.latency()
+    })
+
+@app.route('/ready')
+def ready():
+    """Readiness probe: 503 while warming up or while p99 latency is over the limit"""
+    body, is_ready = readiness.report()
+    return jsonify(body), 200 if is_ready else 503
 
 if __name__ == '__main__':
     print("🚀 Starting Vishwas - Voice-Enabled Scam Detector...")
@@ -0,0 +1,18 @@
+from scam_core import ScamDetector
+from scam_core.dispatch import ScoringPool
+
+VARIANTS = [
+    "please wire transfer the money now",
+    "PLEASE WIRE TRANSFER THE MONEY NOW",
+    "Please wire transfer the money now!!!",
+    "please wire transfer the $5,000 now",
+    "please, wire transfer the money now",
+]
+
+
+def test_pool_matches_detector_for_variants():
+    detector = ScamDetector()
+    with ScoringPool(workers=2) as pool:
+        # Twice, so the second pass is served from the worker caches
+        for _ in range(2):
+            assert pool.score_many(VARIANTS) == [detector.analyze_text(text) for text in VARIANTS]
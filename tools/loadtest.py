@@ -0,0 +1,328 @@
+"""Load generator for the /analyze endpoint.
+
+Replays a recorded request log (JSONL, one request body per line) or a
+synthetic message mix against a server, either one this script starts
+locally (--app) or one that is already running (--url, http or https, with
+an optional path prefix). Load starts once the server's /ready probe answers
+200, or /health for apps without one, so warm-up is not measured.
+
+Closed-loop mode keeps --concurrency clients busy back to back and measures
+the maximum sustainable throughput. Open-loop mode sends at a fixed arrival
+rate (--rate, optionally Poisson) whatever the server does. Latency there is
+measured from the scheduled send time, so queueing delay shows up in the
+tail instead of being hidden (coordinated omission).
+
+Results are written as JSON and can be compared with an earlier run:
+
+    python tools/loadtest.py --app unified_app --mode closed --concurrency 16 --duration 30 --out run1.json
+    python tools/loadtest.py --app unified_app --mode open --rate 500 --duration 30 --compare run1.json
+"""
+import argparse
+import http.client
+import itertools
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PERCENTILES = (50, 95, 99, 99.9)
+
+SYNTHETIC_MIX = [
+    (5, "Hi, are we still on for lunch tomorrow? Best regards"),
+    (3, "URGENT: your account is suspended. Verify account at http://secure-bank.example.com now!!!"),
+    (2, "Congratulations! You are the lottery winner of $1,000,000. Reply with your bank details"),
+    (2, "Aapka khata band ho jayega, turant KYC update karo aur OTP share karo"),
+    (1, "बधाई हो! आप लॉटरी के विजेता हैं। तुरंत इनाम के लिए लिंक पर क्लिक करें"),
+    (1, "Dear customer, " + "please review the attached statement and contact us with questions. " * 40),
+]
+
+
+def load_requests(path: str) -> list:
+    """Request bodies from a JSONL log; plain strings become {'text': ...}"""
+    bodies = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            body = json.loads(line)
+            bodies.append(body if isinstance(body, dict) else {'text': str(body)})
+    return bodies
+
+
+def synthetic_requests(count: int, seed: int) -> list:
+    rng = random.Random(seed)
+    weights = [weight for weight, _ in SYNTHETIC_MIX]
+    texts = [text for _, text in SYNTHETIC_MIX]
+    return [{'text': text} for text in rng.choices(texts, weights=weights, k=count)]
+
+
+def encode(body: dict) -> bytes:
+    # server.py reads 'message', the unified apps read 'text'
+    text = body.get('text', body.get('message', ''))
+    return json.dumps(dict(body, text=text, message=text)).encode('utf-8')
+
+
+class Target:
+    """Where requests go: host, port, scheme and path prefix of the server"""
+
+    def __init__(self, host: str, port: int, https: bool = False, prefix: str = ''):
+        self.host, self.port, self.https, self.prefix = host, port, https, prefix.rstrip('/')
+
+    @classmethod
+    def from_url(cls, url: str) -> 'Target':
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise ValueError(f"--url must be an http:// or https:// URL, got {url!r}")
+        if parts.query or parts.fragment:
+            raise ValueError(f"--url must not have a query or fragment, got {url!r}")
+        https = parts.scheme == 'https'
+        return cls(parts.hostname, parts.port or (443 if https else 80), https, parts.path)
+
+    def connect(self, timeout: float) -> http.client.HTTPConnection:
+        connection = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+        return connection(self.host, self.port, timeout=timeout)
+
+    def url(self, path: str) -> str:
+        return self.prefix + path
+
+
+class Client:
+    """One keep-alive HTTP connection, reopened after errors"""
+
+    def __init__(self, target: Target, timeout: float):
+        self.target, self.timeout = target, timeout
+        self.conn = None
+
+    def post(self, path: str, payload: bytes) -> int:
+        for attempt in range(2):
+            if self.conn is None:
+                self.conn = self.target.connect(self.timeout)
+            try:
+                self.conn.request('POST', self.target.url(path), payload,
+                                  {'Content-Type': 'application/json'})
+                response = self.conn.getresponse()
+                response.read()
+                if response.will_close:
+                    self.conn.close()
+                    self.conn = None
+                return response.status
+            except (http.client.HTTPException, ConnectionError, OSError):
+                self.conn.close()
+                self.conn = None
+                if attempt:
+                    raise
+        return 0
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = []
+        self.errors = 0
+        self.statuses = {}
+
+    def record(self, latency: float, status):
+        with self.lock:
+            self.latencies.append(latency)
+            key = str(status)
+            self.statuses[key] = self.statuses.get(key, 0) + 1
+            if not isinstance(status, int) or status >= 400:
+                self.errors += 1
+
+
+def send(client: Client, path: str, payload: bytes, started: float, recorder: Recorder):
+    try:
+        status = client.post(path, payload)
+    except Exception as e:
+        status = type(e).__name__
+    recorder.record(time.perf_counter() - started, status)
+
+
+def run_closed(args, target, payloads, recorder):
+    deadline = time.perf_counter() + args.duration
+    source = itertools.cycle(payloads)
+    source_lock = threading.Lock()
+
+    def client_loop():
+        client = Client(target, args.timeout)
+        while time.perf_counter() < deadline:
+            with source_lock:
+                payload = next(source)
+            send(client, args.path, payload, time.perf_counter(), recorder)
+
+    threads = [threading.Thread(target=client_loop) for _ in range(args.concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def run_open(args, target, payloads, recorder):
+    rng = random.Random(args.seed)
+    local = threading.local()
+
+    def task(payload, scheduled):
+        if not hasattr(local, 'client'):
+            local.client = Client(target, args.timeout)
+        send(local.client, args.path, payload, scheduled, recorder)
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        start = time.perf_counter()
+        scheduled = start
+        for payload in itertools.cycle(payloads):
+            scheduled += rng.expovariate(args.rate) if args.poisson else 1.0 / args.rate
+            if scheduled - start >= args.duration:
+                break
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(task, payload, scheduled)
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(pct / 100.0 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def summarize(args, recorder: Recorder, elapsed: float) -> dict:
+    latencies = sorted(recorder.latencies)
+    total = len(latencies)
+    return {
+        'config': {
+            'target': args.app or args.url,
+            'mode': args.mode,
+            'concurrency': args.concurrency,
+            'rate': args.rate if args.mode == 'open' else None,
+            'poisson': args.poisson if args.mode == 'open' else None,
+            'duration': args.duration,
+            'requests_source': args.requests or 'synthetic',
+        },
+        'started_at': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime()),
+        'requests': total,
+        'throughput_rps': round(total / elapsed, 1) if elapsed else 0.0,
+        'error_rate': round(recorder.errors / total, 5) if total else 0.0,
+        'statuses': recorder.statuses,
+        'latency_ms': {
+            f'p{pct:g}': round(percentile(latencies, pct) * 1000, 3) for pct in PERCENTILES
+        } | {'max': round(latencies[-1] * 1000, 3) if latencies else 0.0},
+    }
+
+
+def print_summary(summary: dict, baseline: dict = None):
+    def delta(current, previous):
+        if previous in (None, 0):
+            return ''
+        return f"  ({(current - previous) / previous:+.1%} vs baseline)"
+
+    base_latency = (baseline or {}).get('latency_ms', {})
+    print(f"requests    {summary['requests']}")
+    print(f"throughput  {summary['throughput_rps']:.1f} req/s"
+          f"{delta(summary['throughput_rps'], (baseline or {}).get('throughput_rps'))}")
+    print(f"errors      {summary['error_rate']:.3%}  {summary['statuses']}")
+    for key, value in summary['latency_ms'].items():
+        print(f"{key:<11} {value:9.3f} ms{delta(value, base_latency.get(key))}")
+
+
+def start_server(app: str, port: int) -> subprocess.Popen:
+    """Start ``app`` without the debug reloader"""
+    code = (f"import {app}; {app}.app.run(host='127.0.0.1', port={port}, "
+            f"debug=False, threaded=True)")
+    return subprocess.Popen([sys.executable, '-c', code], cwd=REPO_ROOT,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def wait_ready(target: Target, timeout: float, proc: subprocess.Popen = None):
+    """Wait until /ready answers 200, or /health where there is no /ready"""
+    probe = '/ready'
+    deadline = time.monotonic() + timeout
+    status = None
+    while time.monotonic() < deadline:
+        if proc is not None and proc.poll() is not None:
+            raise RuntimeError(f"server exited with status {proc.returncode}")
+        try:
+            conn = target.connect(1.0)
+            conn.request('GET', target.url(probe))
+            status = conn.getresponse().status
+            conn.close()
+        except OSError:
+            status = None
+        if status == 200:
+            return
+        if status == 404 and probe == '/ready':
+            probe = '/health'  # server.py and apps from before readiness probes
+            continue
+        time.sleep(0.1)
+    raise RuntimeError(f"server not ready after {timeout:g} s (GET {probe}: {status})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    server_group = parser.add_mutually_exclusive_group(required=True)
+    server_group.add_argument('--app', help="Module to start locally, e.g. unified_app or server")
+    server_group.add_argument('--url', help="Base URL of a running server, e.g. http://127.0.0.1:5000 "
+                                            "or https://example.com/scam-api")
+    parser.add_argument('--port', type=int, default=5055, help="Port for --app")
+    parser.add_argument('--path', default='/analyze')
+    parser.add_argument('--requests', help="JSONL request log to replay (default: synthetic mix)")
+    parser.add_argument('--mode', choices=('closed', 'open'), default='closed')
+    parser.add_argument('--concurrency', type=int, default=8,
+                        help="Clients (closed) or maximum in-flight requests (open)")
+    parser.add_argument('--rate', type=float, default=100.0, help="Arrivals per second (open)")
+    parser.add_argument('--poisson', action='store_true', help="Exponential inter-arrival times (open)")
+    parser.add_argument('--duration', type=float, default=10.0, help="Seconds to generate load")
+    parser.add_argument('--timeout', type=float, default=10.0)
+    parser.add_argument('--ready-timeout', type=float, default=60.0,
+                        help="Seconds to wait for the server to report ready")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', help="Write the summary JSON here")
+    parser.add_argument('--compare', help="Earlier summary JSON to compare against")
+    args = parser.parse_args()
+
+    bodies = load_requests(args.requests) if args.requests else synthetic_requests(1000, args.seed)
+    payloads = [encode(body) for body in bodies]
+
+    server = None
+    if args.app:
+        target = Target('127.0.0.1', args.port)
+        server = start_server(args.app, args.port)
+    else:
+        try:
+            target = Target.from_url(args.url)
+        except ValueError as e:
+            parser.error(str(e))
+
+    recorder = Recorder()
+    try:
+        wait_ready(target, args.ready_timeout, server)
+        start = time.perf_counter()
+        if args.mode == 'closed':
+            run_closed(args, target, payloads, recorder)
+        else:
+            run_open(args, target, payloads, recorder)
+        elapsed = time.perf_counter() - start
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    summary = summarize(args, recorder, elapsed)
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_summary(summary, baseline)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
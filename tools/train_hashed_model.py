@@ -0,0 +1,181 @@
+"""Offline training for the hashed n-gram model (``scam_core.hashed``).
+
+Every message is hashed with the same ``hashed_features`` function used at
+inference time, into a CSR-style sparse matrix held as three NumPy arrays.
+L2-regularized logistic regression is then fit with full-batch Adam: each
+step is one gather for the margins and one ``bincount`` for the gradient,
+so an epoch costs O(non-zeros) however many buckets the model has.
+
+A held-out split is scored with the rules alone, the model alone and the
+rules blended with the model, and written out as a report next to the model.
+
+Corpus format: as for ``tools/tune_weights.py``.
+
+Usage:
+    python tools/train_hashed_model.py corpus.jsonl --bits 18 --epochs 300 \\
+        --out hashed_model.bin --report hashed_model_report.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from scam_core.detector import CompiledRules  # noqa: E402
+from scam_core.hashed import CHAR_NGRAMS, DEFAULT_BITS, WORD_NGRAMS, HashedModel, hashed_features  # noqa: E402
+from scam_core.rules import default_rule_pack, load_rule_pack  # noqa: E402
+from tune_weights import load_corpus, metrics  # noqa: E402
+
+BLENDS = (0.0, 0.25, 0.5, 0.75, 1.0)
+
+
+def feature_matrix(texts, bits: int, word_ngrams=WORD_NGRAMS, char_ngrams=CHAR_NGRAMS):
+    """Return ``(indptr, indices, values)`` for the hashed feature rows"""
+    indptr = [0]
+    indices = []
+    values = []
+    for text in texts:
+        row_indices, row_values = hashed_features(text, bits, word_ngrams, char_ngrams)
+        indices.extend(row_indices)
+        values.extend(row_values)
+        indptr.append(len(indices))
+    return (np.array(indptr, dtype=np.int64), np.array(indices, dtype=np.int64),
+            np.array(values, dtype=np.float64))
+
+
+def margins(matrix, weights, bias: float):
+    indptr, indices, values = matrix
+    rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+    return np.bincount(rows, weights=weights[indices] * values, minlength=len(indptr) - 1) + bias
+
+
+def train(matrix, labels, bits: int, epochs: int, lr: float, l2: float):
+    """Full-batch Adam on the mean log loss plus ``l2 * |w|^2 / 2``"""
+    indptr, indices, values = matrix
+    rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+    n = labels.shape[0]
+    y = labels.astype(np.float64)
+    weights = np.zeros(1 << bits)
+    bias = 0.0
+    m = np.zeros_like(weights)
+    v = np.zeros_like(weights)
+    mb = vb = 0.0
+    beta1, beta2, eps = 0.9, 0.999, 1e-8
+    for step in range(1, epochs + 1):
+        z = np.bincount(rows, weights=weights[indices] * values, minlength=n) + bias
+        error = 1.0 / (1.0 + np.exp(-np.clip(z, -500, 500))) - y
+        grad = np.bincount(indices, weights=values * error[rows], minlength=1 << bits) / n + l2 * weights
+        grad_bias = error.mean()
+        m = beta1 * m + (1 - beta1) * grad
+        v = beta2 * v + (1 - beta2) * grad * grad
+        mb = beta1 * mb + (1 - beta1) * grad_bias
+        vb = beta2 * vb + (1 - beta2) * grad_bias * grad_bias
+        correction1 = 1 - beta1 ** step
+        correction2 = 1 - beta2 ** step
+        weights -= lr * (m / correction1) / (np.sqrt(v / correction2) + eps)
+        bias -= lr * (mb / correction1) / (np.sqrt(vb / correction2) + eps)
+        if step % 50 == 0 or step == epochs:
+            p = np.clip(1.0 / (1.0 + np.exp(-np.clip(z, -500, 500))), 1e-12, 1 - 1e-12)
+            loss = -np.mean(y * np.log(p) + (1 - y) * np.log(1 - p))
+            print(f"epoch {step:4d}  train log loss {loss:.4f}")
+    return weights.astype(np.float32), float(bias)
+
+
+def auc(scores, labels) -> float:
+    """Area under the ROC curve from score ranks (ties averaged)"""
+    positives = int(labels.sum())
+    negatives = labels.shape[0] - positives
+    if not positives or not negatives:
+        return float('nan')
+    order = np.argsort(scores, kind='mergesort')
+    ranks = np.empty(scores.shape[0])
+    sorted_scores = scores[order]
+    # Average ranks over runs of equal scores
+    starts = np.r_[0, np.flatnonzero(np.diff(sorted_scores)) + 1]
+    ends = np.r_[starts[1:], scores.shape[0]]
+    for start, end in zip(starts, ends):
+        ranks[order[start:end]] = (start + end + 1) / 2.0
+    return float((ranks[labels].sum() - positives * (positives + 1) / 2) / (positives * negatives))
+
+
+def report_for(scores, labels, threshold: float) -> dict:
+    precision, recall, f1 = metrics(scores, labels, np.array([threshold]))
+    predicted = scores >= threshold
+    return {
+        'threshold': threshold,
+        'accuracy': round(float((predicted == labels).mean()), 4),
+        'precision': round(float(precision[0]), 4),
+        'recall': round(float(recall[0]), 4),
+        'f1': round(float(f1[0]), 4),
+        'auc': round(auc(scores, labels), 4),
+        'messages': int(labels.shape[0]),
+        'positives': int(labels.sum()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('corpus')
+    parser.add_argument('--rule-pack', help="Rules to blend with (default: built-in rules)")
+    parser.add_argument('--bits', type=int, default=DEFAULT_BITS)
+    parser.add_argument('--word-ngrams', type=int, nargs=2, default=WORD_NGRAMS, metavar=('MIN', 'MAX'))
+    parser.add_argument('--char-ngrams', type=int, nargs=2, default=CHAR_NGRAMS, metavar=('MIN', 'MAX'))
+    parser.add_argument('--epochs', type=int, default=300)
+    parser.add_argument('--lr', type=float, default=0.05)
+    parser.add_argument('--l2', type=float, default=1e-5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--holdout', type=float, default=0.2, help="Fraction kept out of training")
+    parser.add_argument('--version', default='hashed-1')
+    parser.add_argument('--out', default='hashed_model.bin')
+    parser.add_argument('--report', default='hashed_model_report.json')
+    args = parser.parse_args()
+
+    texts, labels = load_corpus(args.corpus)
+    order = np.random.default_rng(args.seed).permutation(labels.shape[0])
+    n_holdout = int(labels.shape[0] * args.holdout)
+    train_rows, holdout_rows = np.sort(order[n_holdout:]), np.sort(order[:n_holdout])
+
+    start = time.perf_counter()
+    train_matrix = feature_matrix([texts[i] for i in train_rows], args.bits, args.word_ngrams, args.char_ngrams)
+    holdout_matrix = feature_matrix([texts[i] for i in holdout_rows], args.bits, args.word_ngrams, args.char_ngrams)
+    print(f"Hashed {len(texts)} messages into 2^{args.bits} buckets "
+          f"({train_matrix[1].shape[0] + holdout_matrix[1].shape[0]} non-zeros) "
+          f"in {time.perf_counter() - start:.1f} s")
+
+    start = time.perf_counter()
+    weights, bias = train(train_matrix, labels[train_rows], args.bits, args.epochs, args.lr, args.l2)
+    print(f"Trained in {time.perf_counter() - start:.1f} s")
+    model = HashedModel(weights.tolist(), bias, args.bits, args.word_ngrams, args.char_ngrams, args.version)
+    model.save(args.out)
+
+    pack = load_rule_pack(args.rule_pack) if args.rule_pack else default_rule_pack()
+    compiled = CompiledRules(pack)
+    threshold = float(compiled.scam_threshold)
+    y_hold = labels[holdout_rows]
+    rule_scores = np.array([compiled.scan(texts[i]).score for i in holdout_rows])
+    model_scores = 100.0 / (1.0 + np.exp(-np.clip(margins(holdout_matrix, weights, bias), -500, 500)))
+    report = {
+        'model': model.settings(),
+        'train_messages': int(train_rows.shape[0]),
+        'holdout': {
+            f"blend_{blend}": report_for((1 - blend) * rule_scores + blend * model_scores, y_hold, threshold)
+            for blend in BLENDS
+        },
+    }
+    with open(args.report, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    print("holdout (blend 0 = rules only, 1 = model only)")
+    for name, r in report['holdout'].items():
+        print(f"{name:<11} accuracy {r['accuracy']:.3f}  precision {r['precision']:.3f}  "
+              f"recall {r['recall']:.3f}  f1 {r['f1']:.3f}  auc {r['auc']:.3f}")
+    print(f"Wrote {args.out} and {args.report}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,254 @@
+"""Offline weight tuning for the scam_core rule pack.
+
+The per-rule feature matrix of a labeled corpus is extracted once and cached
+as a NumPy array, so scoring a candidate weight vector is a single
+matrix-vector product instead of a full rescoring pass. Candidates are
+searched in parallel across cores and the best one is written out as a rule
+pack together with a precision/recall report.
+
+Corpus format: JSONL with ``{"text": ..., "label": 0|1}`` per line, or CSV
+with ``text`` and ``label`` columns.
+
+Usage:
+    python tools/tune_weights.py corpus.jsonl --search random --candidates 5000 \\
+        --out tuned_pack.json --report tuning_report.json
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+from multiprocessing import Pool
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scam_core.detector import CompiledRules  # noqa: E402
+from scam_core.rules import default_rule_pack, load_rule_pack  # noqa: E402
+
+THRESHOLDS = np.arange(5, 96, 1, dtype=np.float64)
+GRID_SCALES = (0.5, 0.75, 1.0, 1.25, 1.5, 2.0)
+TRUE_LABELS = {'1', 'true', 'scam', 'yes'}
+
+_X = None
+_y = None
+_rows = None
+
+
+def load_corpus(path: str):
+    """Return (texts, labels) from a JSONL or CSV corpus"""
+    texts, labels = [], []
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith('.csv'):
+            rows = csv.DictReader(f)
+        else:
+            rows = (json.loads(line) for line in f if line.strip())
+        for row in rows:
+            texts.append(row['text'])
+            labels.append(str(row['label']).strip().lower() in TRUE_LABELS)
+    return texts, np.array(labels, dtype=bool)
+
+
+def feature_cache_paths(corpus_path: str, compiled: CompiledRules, cache_dir: str):
+    """Cache key covers the corpus bytes and the rule set, not the weights"""
+    digest = hashlib.sha256()
+    with open(corpus_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    digest.update(json.dumps(compiled.feature_names()).encode('utf-8'))
+    digest.update(repr((compiled.exclamation_threshold, compiled.caps_ratio_threshold)).encode('utf-8'))
+    key = digest.hexdigest()[:16]
+    return (os.path.join(cache_dir, f'{key}.X.npy'),
+            os.path.join(cache_dir, f'{key}.y.npy'))
+
+
+def build_feature_matrix(corpus_path: str, compiled: CompiledRules, cache_dir: str):
+    """Extract (or load from cache) the feature matrix and labels"""
+    x_path, y_path = feature_cache_paths(corpus_path, compiled, cache_dir)
+    if os.path.exists(x_path) and os.path.exists(y_path):
+        print(f"Using cached features {x_path}")
+        return x_path, y_path
+
+    texts, labels = load_corpus(corpus_path)
+    X = np.zeros((len(texts), len(compiled.feature_names())), dtype=np.float32)
+    for i, text in enumerate(texts):
+        X[i] = compiled.features(text)
+    os.makedirs(cache_dir, exist_ok=True)
+    np.save(x_path, X)
+    np.save(y_path, labels)
+    print(f"Extracted {X.shape[0]} x {X.shape[1]} feature matrix to {x_path}")
+    return x_path, y_path
+
+
+def _init_worker(x_path: str, y_path: str, rows):
+    global _X, _y, _rows
+    # Memory-mapped so every worker reads the same pages
+    _X = np.load(x_path, mmap_mode='r')
+    _rows = rows
+    _y = np.load(y_path)[rows]
+
+
+def metrics(scores, labels, thresholds):
+    """Precision, recall and F1 for every threshold in one vectorized pass"""
+    predicted = scores[:, None] >= thresholds[None, :]
+    tp = (predicted & labels[:, None]).sum(axis=0)
+    fp = (predicted & ~labels[:, None]).sum(axis=0)
+    fn = (~predicted & labels[:, None]).sum(axis=0)
+    precision = tp / np.maximum(tp + fp, 1)
+    recall = tp / np.maximum(tp + fn, 1)
+    f1 = 2 * precision * recall / np.maximum(precision + recall, 1e-12)
+    return precision, recall, f1
+
+
+def normalized_scores(X, weights, max_possible_score):
+    return np.minimum(X @ weights / max_possible_score * 100, 100)
+
+
+def evaluate(args):
+    """Score one candidate; returns (f1, threshold, index)"""
+    index, weights, max_possible_score = args
+    scores = normalized_scores(_X, weights, max_possible_score)[_rows]
+    _, _, f1 = metrics(scores, _y, THRESHOLDS)
+    best = int(np.argmax(f1))
+    return float(f1[best]), float(THRESHOLDS[best]), index
+
+
+def feature_groups(names):
+    """Column index arrays for the grid search's per-group multipliers"""
+    groups = {}
+    for i, name in enumerate(names):
+        # Language-tagged keywords ("keyword[hi]:...") share the keyword group
+        group = name.split(':', 1)[0].split('[', 1)[0] if ':' in name else 'characteristics'
+        groups.setdefault(group, []).append(i)
+    return [np.array(cols) for cols in groups.values()]
+
+
+def generate_candidates(base, names, search, count, sigma, seed):
+    """Yield candidate weight vectors, the base vector first"""
+    yield base.copy()
+    if search == 'grid':
+        groups = feature_groups(names)
+        for combo in np.array(np.meshgrid(*[GRID_SCALES] * len(groups))).T.reshape(-1, len(groups)):
+            weights = base.copy()
+            for cols, scale in zip(groups, combo):
+                weights[cols] *= scale
+            yield weights
+    else:
+        rng = np.random.default_rng(seed)
+        for _ in range(count):
+            yield base * np.exp(rng.normal(0.0, sigma, size=base.shape))
+
+
+def tuned_rule_pack(pack: dict, compiled: CompiledRules, weights, threshold: float) -> dict:
+    """Copy ``pack`` with the candidate weights and best cut-off applied"""
+    tuned = json.loads(json.dumps(pack))
+    n_kw = len(compiled.scam_keywords)
+    n_sp = len(compiled.suspicious_patterns)
+    w = [round(float(v), 3) for v in weights]
+
+    tuned['scam_keywords'] = {k: w[i] for i, (k, _) in enumerate(compiled.scam_keywords)}
+    tuned['suspicious_patterns'] = [[p, w[n_kw + i]] for i, (p, _, _) in enumerate(compiled.suspicious_patterns)]
+    tuned['legitimate_patterns'] = [
+        [regex.pattern, w[n_kw + n_sp + i]] for i, (regex, _) in enumerate(compiled.legitimate_patterns)
+    ]
+    tuned['exclamation_weight'] = w[compiled.exclamation_id]
+    tuned['caps_ratio_weight'] = w[compiled.caps_ratio_id]
+    tuned['urgency_weight'] = w[compiled.urgency_id]
+    for tag, _, table, base in compiled.language_packs:
+        tuned['language_packs'][tag]['scam_keywords'] = {
+            k: w[base + i] for i, (k, _) in enumerate(table)
+        }
+
+    # Rescale max_possible_score so the best cut-off lands on the pack's own
+    # scam threshold; the risk bands then keep their meaning unchanged
+    tuned['max_possible_score'] = round(pack['max_possible_score'] * threshold / pack['scam_threshold'], 3)
+    tuned['version'] = f"{pack['version']}-tuned"
+    return tuned
+
+
+def report_for(X, labels, weights, max_possible_score, threshold):
+    scores = normalized_scores(X, weights, max_possible_score)
+    precision, recall, f1 = metrics(scores, labels, np.array([threshold]))
+    return {
+        'threshold': threshold,
+        'precision': round(float(precision[0]), 4),
+        'recall': round(float(recall[0]), 4),
+        'f1': round(float(f1[0]), 4),
+        'messages': int(labels.shape[0]),
+        'positives': int(labels.sum()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('corpus')
+    parser.add_argument('--rule-pack', help="Starting rule pack (default: built-in rules)")
+    parser.add_argument('--search', choices=('random', 'grid'), default='random')
+    parser.add_argument('--candidates', type=int, default=2000, help="Random search size")
+    parser.add_argument('--sigma', type=float, default=0.35, help="Log-normal spread of random search")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--holdout', type=float, default=0.2, help="Fraction kept out of the search")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--cache-dir', default='.tuning_cache')
+    parser.add_argument('--out', default='tuned_rule_pack.json')
+    parser.add_argument('--report', default='tuning_report.json')
+    args = parser.parse_args()
+
+    pack = load_rule_pack(args.rule_pack) if args.rule_pack else default_rule_pack()
+    compiled = CompiledRules(pack)
+    names = compiled.feature_names()
+    base = np.array(compiled.weights(), dtype=np.float64)
+    max_possible_score = float(compiled.max_possible_score)
+
+    x_path, y_path = build_feature_matrix(args.corpus, compiled, args.cache_dir)
+    X = np.load(x_path, mmap_mode='r')
+    labels = np.load(y_path)
+    order = np.random.default_rng(args.seed).permutation(labels.shape[0])
+    n_holdout = int(labels.shape[0] * args.holdout)
+    train_rows, holdout_rows = np.sort(order[n_holdout:]), np.sort(order[:n_holdout])
+
+    candidates = list(generate_candidates(base, names, args.search, args.candidates, args.sigma, args.seed))
+    jobs = ((i, w, max_possible_score) for i, w in enumerate(candidates))
+    with Pool(args.workers, initializer=_init_worker, initargs=(x_path, y_path, train_rows)) as pool:
+        results = list(pool.imap_unordered(evaluate, jobs, chunksize=64))
+    best_f1, best_threshold, best_index = max(results)
+    best = candidates[best_index]
+
+    X_train, y_train = X[train_rows], labels[train_rows]
+    X_hold, y_hold = X[holdout_rows], labels[holdout_rows]
+    baseline_threshold = float(pack['scam_threshold'])
+    report = {
+        'search': args.search,
+        'candidates': len(candidates),
+        'baseline': {
+            'train': report_for(X_train, y_train, base, max_possible_score, baseline_threshold),
+            'holdout': report_for(X_hold, y_hold, base, max_possible_score, baseline_threshold),
+        },
+        'tuned': {
+            'train': report_for(X_train, y_train, best, max_possible_score, best_threshold),
+            'holdout': report_for(X_hold, y_hold, best, max_possible_score, best_threshold),
+        },
+        'largest_weight_changes': sorted(
+            ({'rule': n, 'from': round(float(a), 3), 'to': round(float(b), 3)}
+             for n, a, b in zip(names, base, best) if abs(a - b) > 1e-9),
+            key=lambda change: -abs(change['to'] - change['from'])
+        )[:15],
+    }
+
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(tuned_rule_pack(pack, compiled, best, best_threshold), f, indent=2)
+    with open(args.report, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    for stage in ('baseline', 'tuned'):
+        for split in ('train', 'holdout'):
+            r = report[stage][split]
+            print(f"{stage:<9}{split:<8} threshold {r['threshold']:5.1f}  precision {r['precision']:.3f}  "
+                  f"recall {r['recall']:.3f}  f1 {r['f1']:.3f}")
+    print(f"Best train F1 {best_f1:.4f}; wrote {args.out} and {args.report}")
+
+
+if __name__ == '__main__':
+    main()